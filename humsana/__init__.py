@@ -15,20 +15,73 @@ __version__ = "2.0.0"
 __author__ = "Humsana"
 __license__ = "MIT"
 
-from .collector import SignalCollector, SignalSnapshot
-from .analyzer import SignalAnalyzer, AnalysisResult, UserState
-from .local_db import LocalDatabase, get_db_path
-from .config import HumsanaConfig, load_config, get_config_path
-from .activity_tracker import get_activity_tracker, ActivityTracker
-from .audit import get_audit_logger, AuditLogger
-from .interlock import get_interlock, HumsanaInterlock, InterlockResult
-from .notifications import NotificationManager  # NEW
-from .auth import authenticate_slack, disconnect_slack, show_auth_status
+import importlib
+
+# Public names are imported on first use (PEP 562), so e.g. `humsana status`
+# doesn't pay for pynput, sqlite3 or requests until something needs them.
+_LAZY = {
+    # Collector
+    "SignalCollector": "collector",
+    "SignalSnapshot": "collector",
+    "SignalBuffer": "collector",
+    "SignalWindow": "collector",
+    
+    # Analyzer
+    "SignalAnalyzer": "analyzer",
+    "AnalysisResult": "analyzer",
+    "UserState": "analyzer",
+    
+    # Database
+    "LocalDatabase": "local_db",
+    "get_db_path": "local_db",
+    
+    # Config
+    "HumsanaConfig": "config",
+    "load_config": "config",
+    "get_config_path": "config",
+    
+    # Activity Tracker
+    "get_activity_tracker": "activity_tracker",
+    "ActivityTracker": "activity_tracker",
+    
+    # Audit
+    "get_audit_logger": "audit",
+    "AuditLogger": "audit",
+    
+    # Interlock
+    "get_interlock": "interlock",
+    "HumsanaInterlock": "interlock",
+    "InterlockResult": "interlock",
+    
+    # Notifications (NEW)
+    "NotificationManager": "notifications",
+    
+    # Slack
+    "authenticate_slack": "auth",
+    "disconnect_slack": "auth",
+    "show_auth_status": "auth",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
 
 __all__ = [
     # Collector
     "SignalCollector",
     "SignalSnapshot",
+    "SignalBuffer",
+    "SignalWindow",
     
     # Analyzer
     "SignalAnalyzer",
@@ -4,28 +4,46 @@ Tracks "Cognitive Uptime" - hours since last restorative break.
 
 A "restorative break" is defined as 60+ minutes of inactivity.
 This is the key metric for fatigue detection.
+
+Heartbeats are appended to ~/.humsana/activity.jsonl, one JSON object per line.
 """
 
+import atexit
 import json
+import os
+import threading
 import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
-from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional, List, Dict, TextIO
+from dataclasses import dataclass
+
+
+# Compact, C-accelerated encoder for log lines (built once; json.dumps with
+# custom separators would construct a new encoder on every call)
+_encode = json.JSONEncoder(separators=(",", ":")).encode
 
 
 def get_activity_path() -> Path:
-    """Get path to activity tracking file."""
+    """Get path to activity tracking log (one JSON heartbeat per line)."""
     humsana_dir = Path.home() / ".humsana"
     humsana_dir.mkdir(exist_ok=True)
-    return humsana_dir / "activity.json"
+    return humsana_dir / "activity.jsonl"
+
+
+def get_legacy_activity_path() -> Path:
+    """Get path to the pre-NDJSON activity file (read once for migration)."""
+    return Path.home() / ".humsana" / "activity.json"
 
 
 @dataclass
 class ActivityHeartbeat:
     """A single heartbeat indicating user activity."""
+    __slots__ = ("timestamp", "source", "epoch")
+    
     timestamp: str
     source: str  # 'keyboard', 'mouse', 'api'
+    epoch: float  # Same instant as `timestamp`, in seconds since the epoch
 
 
 class ActivityTracker:
@@ -45,64 +63,198 @@ class ActivityTracker:
     # How long to keep heartbeat history
     HISTORY_HOURS = 24
     
+    # Rewrite the log once it holds this many expired heartbeats
+    COMPACT_EVERY = 1000
+    
+    # Heartbeats are buffered and written to disk in groups of this many,
+    # or sooner once the oldest buffered one is FLUSH_MAX_AGE seconds old
+    # (atexit doesn't run on SIGTERM, and other processes read the log)
+    FLUSH_EVERY = 10
+    FLUSH_MAX_AGE = 120
+    
     def __init__(self):
         self.activity_path = get_activity_path()
+        self._log_file: Optional[TextIO] = None
+        self._log_lines = 0  # Heartbeat lines currently in the log file
+        self._pending: List[ActivityHeartbeat] = []  # Recorded but not yet written
+        self._uptime_start: Optional[float] = None  # Cached last break; None = rescan
+        # Checks may come from several threads (Interlock.aexecute_command)
+        self._lock = threading.Lock()
         self._load_heartbeats()
+        
+        # Epoch of the newest heartbeat, for the per-event throttle check
+        self._last_epoch = self.heartbeats[-1].epoch if self.heartbeats else float('-inf')
+        
+        # Don't lose the buffered tail on shutdown
+        atexit.register(self._flush_on_exit)
     
     def _load_heartbeats(self) -> None:
         """Load heartbeats from disk."""
-        if self.activity_path.exists():
-            try:
-                with open(self.activity_path, 'r') as f:
-                    data = json.load(f)
-                    self.heartbeats = [
-                        ActivityHeartbeat(**hb) for hb in data.get('heartbeats', [])
-                    ]
-            except (json.JSONDecodeError, KeyError):
-                self.heartbeats = []
-        else:
+        self.heartbeats = []
+        
+        if not self.activity_path.exists():
+            self._migrate_legacy_file()
+            return
+        
+        line = "\n"
+        with open(self.activity_path, 'r') as f:
+            for line in f:
+                self._log_lines += 1
+                try:
+                    self.heartbeats.append(self._parse_heartbeat(json.loads(line)))
+                except (json.JSONDecodeError, KeyError, ValueError):
+                    # Torn or corrupt line (e.g. crash mid-append) - skip it
+                    continue
+        
+        # A torn final line would swallow the next append; rewrite it away
+        if not line.endswith("\n"):
+            self._compact()
+    
+    def _migrate_legacy_file(self) -> None:
+        """Import heartbeats from the old single-document activity.json."""
+        legacy_path = get_legacy_activity_path()
+        if not legacy_path.exists():
+            return
+        
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+                self.heartbeats = [
+                    self._parse_heartbeat(hb) for hb in data.get('heartbeats', [])
+                ]
+        except (json.JSONDecodeError, KeyError, ValueError):
             self.heartbeats = []
+            return
+        
+        self._compact()
+    
+    @staticmethod
+    def _parse_heartbeat(hb: Dict) -> ActivityHeartbeat:
+        """
+        Build a heartbeat from its stored dict.
+        The ISO timestamp is parsed here once, so every later comparison
+        is a plain float subtraction.
+        """
+        epoch = hb.get('epoch')
+        if epoch is None:
+            # Files written before `epoch` existed only have the ISO string
+            epoch = datetime.fromisoformat(hb['timestamp']).timestamp()
+        return ActivityHeartbeat(
+            timestamp=hb['timestamp'],
+            source=hb['source'],
+            epoch=epoch
+        )
+    
+    @staticmethod
+    def _format_line(hb: ActivityHeartbeat) -> str:
+        """One log line for a heartbeat (asdict() would deep-copy each field)."""
+        return _encode({
+            'timestamp': hb.timestamp,
+            'source': hb.source,
+            'epoch': hb.epoch
+        }) + "\n"
+    
+    def _flush_on_exit(self) -> None:
+        """Write any buffered heartbeats before the process exits."""
+        with self._lock:
+            self._flush()
+    
+    def _log_handle(self) -> TextIO:
+        """
+        The append handle for the log. Reopened by path if another process
+        (the CLI or MCP server) has compacted the file since, as appends to
+        the replaced inode would be lost without an error.
+        """
+        if self._log_file is not None:
+            try:
+                if (os.fstat(self._log_file.fileno()).st_ino
+                        == os.stat(self.activity_path).st_ino):
+                    return self._log_file
+            except FileNotFoundError:
+                pass
+            self._log_file.close()
+        self._log_file = open(self.activity_path, 'a')
+        return self._log_file
     
-    def _save_heartbeats(self) -> None:
-        """Save heartbeats to disk."""
-        # Clean old heartbeats first
+    def _flush(self) -> None:
+        """
+        Append the pending heartbeats to the log in a single write.
+        Caller holds self._lock (as for _compact()).
+        
+        O(pending) per flush: the file is only rewritten by _compact(),
+        once enough expired lines have piled up.
+        """
+        if not self._pending:
+            return
+        
+        log_file = self._log_handle()
+        log_file.write(
+            "".join(map(self._format_line, self._pending))
+        )
+        log_file.flush()
+        self._log_lines += len(self._pending)
+        self._pending.clear()
+        
+        # Compact if the log is mostly dead weight
+        if self._log_lines - len(self.heartbeats) >= self.COMPACT_EVERY:
+            self._compact()
+    
+    def _compact(self) -> None:
+        """Rewrite the log with only the live heartbeats."""
         self._cleanup_old_heartbeats()
         
-        data = {
-            'heartbeats': [asdict(hb) for hb in self.heartbeats],
-            'last_updated': datetime.now().isoformat()
-        }
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
         
-        with open(self.activity_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        tmp_path = self.activity_path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'w') as f:
+            f.writelines(map(self._format_line, self.heartbeats))
+        os.replace(tmp_path, self.activity_path)
+        self._log_lines = len(self.heartbeats)
+        self._pending.clear()  # Everything live is on disk now
     
     def _cleanup_old_heartbeats(self) -> None:
         """Remove heartbeats older than HISTORY_HOURS."""
-        cutoff = datetime.now() - timedelta(hours=self.HISTORY_HOURS)
+        cutoff = time.time() - self.HISTORY_HOURS * 3600
         self.heartbeats = [
             hb for hb in self.heartbeats
-            if datetime.fromisoformat(hb.timestamp) > cutoff
+            if hb.epoch > cutoff
         ]
+        
+        # Runs after every append too, so this is the one place the
+        # heartbeat set changes - the cached break may be stale
+        self._uptime_start = None
     
     def record_activity(self, source: str = 'keyboard') -> None:
         """
         Record a heartbeat.
         Called by the daemon when activity is detected.
         """
-        now = datetime.now()
+        with self._lock:
+            self._record_locked(source)
+    
+    def _record_locked(self, source: str) -> None:
+        """record_activity() body; caller holds self._lock."""
+        now = time.time()
         
         # Only record if we haven't recorded in the last minute
-        if self.heartbeats:
-            last_hb = datetime.fromisoformat(self.heartbeats[-1].timestamp)
-            if (now - last_hb).total_seconds() < 60:
-                return  # Too soon, skip
+        if now - self._last_epoch < 60:
+            return  # Too soon, skip
+        self._last_epoch = now
         
         heartbeat = ActivityHeartbeat(
-            timestamp=now.isoformat(),
-            source=source
+            timestamp=datetime.fromtimestamp(now).isoformat(),
+            source=source,
+            epoch=now
         )
         self.heartbeats.append(heartbeat)
-        self._save_heartbeats()
+        self._cleanup_old_heartbeats()
+        
+        self._pending.append(heartbeat)
+        if (len(self._pending) >= self.FLUSH_EVERY
+                or now - self._pending[0].epoch >= self.FLUSH_MAX_AGE):
+            self._flush()
     
     def get_cognitive_uptime_hours(self) -> float:
         """
@@ -111,36 +263,56 @@ class ActivityTracker:
         Returns:
             Hours since last break (>= 60 min gap)
         """
+        with self._lock:
+            return self._uptime_locked()
+    
+    def _uptime_locked(self) -> float:
+        """get_cognitive_uptime_hours() body; caller holds self._lock."""
         if not self.heartbeats:
             return 0.0
         
-        now = datetime.now()
+        # Activity may have stopped with heartbeats still buffered
+        if self._pending and time.time() - self._pending[0].epoch >= self.FLUSH_MAX_AGE:
+            self._flush()
         
-        # Sort heartbeats by timestamp (should already be sorted, but be safe)
-        sorted_hbs = sorted(
-            self.heartbeats,
-            key=lambda hb: datetime.fromisoformat(hb.timestamp)
-        )
+        # The last break only moves when heartbeats change, so repeated
+        # queries between heartbeats skip the scan
+        if self._uptime_start is None:
+            self._uptime_start = self._find_last_break()
+        
+        # Calculate uptime
+        uptime_hours = (time.time() - self._uptime_start) / 3600
+        return max(0.0, uptime_hours)
+    
+    def _find_last_break(self) -> float:
+        """Epoch where the current stretch of activity started."""
+        # Already in time order: record_activity() only appends heartbeats
+        # at least 60s newer than the last one (a clock jumping backwards
+        # fails that check too)
+        heartbeats = self.heartbeats
         
-        # Find the last break (gap > BREAK_THRESHOLD_MINUTES)
+        # Find the last break (gap > BREAK_THRESHOLD_MINUTES), newest first
+        break_seconds = self.BREAK_THRESHOLD_MINUTES * 60
+        first = heartbeats[0].epoch
         last_break_time = None
         
-        for i in range(len(sorted_hbs) - 1, 0, -1):
-            current = datetime.fromisoformat(sorted_hbs[i].timestamp)
-            previous = datetime.fromisoformat(sorted_hbs[i-1].timestamp)
-            gap_minutes = (current - previous).total_seconds() / 60
+        current = heartbeats[-1].epoch
+        for i in range(len(heartbeats) - 2, -1, -1):
+            # Everything left spans less than a break, so no gap can be one
+            if current - first < break_seconds:
+                break
             
-            if gap_minutes >= self.BREAK_THRESHOLD_MINUTES:
+            previous = heartbeats[i].epoch
+            if current - previous >= break_seconds:
                 last_break_time = current
                 break
+            current = previous
         
         # If no break found, use the first heartbeat as the "start"
         if last_break_time is None:
-            last_break_time = datetime.fromisoformat(sorted_hbs[0].timestamp)
+            last_break_time = first
         
-        # Calculate uptime
-        uptime_hours = (now - last_break_time).total_seconds() / 3600
-        return max(0.0, uptime_hours)
+        return last_break_time
     
     def get_fatigue_level(self, current_stress: float = 0.0) -> int:
         """
@@ -156,8 +328,11 @@ class ActivityTracker:
         Returns:
             Fatigue level 0-100
         """
-        uptime = self.get_cognitive_uptime_hours()
-        
+        return self._fatigue_from(self.get_cognitive_uptime_hours(), current_stress)
+    
+    @staticmethod
+    def _fatigue_from(uptime: float, current_stress: float) -> int:
+        """Fatigue level (0-100) for a given uptime in hours and stress."""
         # Base fatigue from uptime
         # 0h = 0%, 4h = 20%, 8h = 40%, 12h = 60%
         base_fatigue = min(60, (uptime / 12) * 60)
@@ -178,8 +353,8 @@ class ActivityTracker:
         - uptime_hours: float
         - recommendation: str
         """
-        fatigue = self.get_fatigue_level(current_stress)
         uptime = self.get_cognitive_uptime_hours()
+        fatigue = self._fatigue_from(uptime, current_stress)
         
         if fatigue < 30:
             category = 'low'
@@ -10,12 +10,34 @@ The Signal Library (mapping from physics to psychology) is our core IP.
 These thresholds were calibrated through research and testing.
 """
 
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Deque, List, Optional, Tuple, Union
 from enum import Enum
-import statistics
+from types import MappingProxyType
 
-from .collector import SignalSnapshot
+from .collector import SignalSnapshot, SignalWindow, SignalBuffer
+
+
+# Thresholds (calibrated values)
+# Plain module constants: the scorers run on every batch, and a global
+# load is cheaper than a class-dict lookup per comparison.
+STRESS_HIGH_WPM = 80              # Words per minute indicating stress
+STRESS_HIGH_BACKSPACE = 0.15      # >15% corrections = anxiety
+STRESS_HIGH_VARIANCE = 10000      # High rhythm variance = erratic
+
+FOCUS_SUSTAINED_TYPING = 30       # Seconds of continuous typing
+FOCUS_LOW_VARIANCE = 3000         # Consistent rhythm = flow state
+FOCUS_NO_IDLE = 5                 # No pause > 5 seconds
+
+# NEW: Adrenaline detection thresholds
+ADRENALINE_MIN_WPM = 90           # Must be typing fast
+ADRENALINE_MAX_BACKSPACE = 0.05   # But with very few errors
+ADRENALINE_MIN_FOCUS = 0.7        # And high focus
+
+# NEW: Fatigue detection thresholds
+FATIGUE_MIN_BACKSPACE = 0.15      # High error rate
+FATIGUE_MIN_COGNITIVE_LOAD = 0.8  # High cognitive load
 
 
 class UserState(Enum):
@@ -29,9 +51,44 @@ class UserState(Enum):
     ADRENALINE = "adrenaline" # High speed, high accuracy - P0/Flow state
 
 
+# (response_style, avoid_clarifying_questions, interruptible) per state
+_RECOMMENDATIONS = {
+    # NEW: Adrenaline mode - user is "in the zone" or handling P0
+    # Be extremely concise, no chatter, just execute
+    UserState.ADRENALINE: ("concise_command_mode", True, False),
+    
+    # NEW: Fatigued mode - user is making mistakes
+    # Be protective, double-check things, add friction
+    UserState.FATIGUED: ("protective", True, False),
+    
+    # User is problem-solving under pressure
+    UserState.DEBUGGING: ("concise", True, False),
+    
+    # User is stressed - be brief and direct
+    UserState.STRESSED: ("concise", True, False),
+    
+    # User is in flow - don't interrupt unnecessarily
+    UserState.FOCUSED: ("detailed", False, False),
+    
+    # Normal working mode
+    UserState.WORKING: ("detailed", False, True),
+    
+    # Relaxed - full engagement OK
+    UserState.RELAXED: ("friendly", False, True),
+}
+
+
 @dataclass
 class AnalysisResult:
     """Result of analyzing behavioral signals."""
+    # No per-instance __dict__ (dataclass(slots=True) needs Python 3.10)
+    __slots__ = (
+        "stress_level", "focus_level", "cognitive_load", "state",
+        "confidence", "response_style", "avoid_clarifying_questions",
+        "interruptible", "typing_wpm", "backspace_ratio",
+        "rhythm_variance", "idle_seconds",
+    )
+    
     # Core scores (0.0 to 1.0)
     stress_level: float
     focus_level: float
@@ -66,51 +123,54 @@ class SignalAnalyzer:
     are the result of behavioral research and calibration.
     """
     
-    # Thresholds (calibrated values)
-    STRESS_THRESHOLDS = {
-        "high_wpm": 80,           # Words per minute indicating stress
-        "high_backspace": 0.15,   # >15% corrections = anxiety
-        "high_variance": 10000,   # High rhythm variance = erratic
-    }
+    # Thresholds (calibrated values). The scoring code reads the module
+    # constants; these dicts mirror them for reference.
+    STRESS_THRESHOLDS = MappingProxyType({
+        "high_wpm": STRESS_HIGH_WPM,
+        "high_backspace": STRESS_HIGH_BACKSPACE,
+        "high_variance": STRESS_HIGH_VARIANCE,
+    })
     
-    FOCUS_THRESHOLDS = {
-        "sustained_typing": 30,   # Seconds of continuous typing
-        "low_variance": 3000,     # Consistent rhythm = flow state
-        "no_idle": 5,             # No pause > 5 seconds
-    }
+    FOCUS_THRESHOLDS = MappingProxyType({
+        "sustained_typing": FOCUS_SUSTAINED_TYPING,
+        "low_variance": FOCUS_LOW_VARIANCE,
+        "no_idle": FOCUS_NO_IDLE,
+    })
     
     # NEW: Adrenaline detection thresholds
-    ADRENALINE_THRESHOLDS = {
-        "min_wpm": 90,            # Must be typing fast
-        "max_backspace": 0.05,   # But with very few errors
-        "min_focus": 0.7,         # And high focus
-    }
+    ADRENALINE_THRESHOLDS = MappingProxyType({
+        "min_wpm": ADRENALINE_MIN_WPM,
+        "max_backspace": ADRENALINE_MAX_BACKSPACE,
+        "min_focus": ADRENALINE_MIN_FOCUS,
+    })
     
     # NEW: Fatigue detection thresholds
-    FATIGUE_THRESHOLDS = {
-        "min_backspace": 0.15,   # High error rate
-        "min_cognitive_load": 0.8, # High cognitive load
-    }
+    FATIGUE_THRESHOLDS = MappingProxyType({
+        "min_backspace": FATIGUE_MIN_BACKSPACE,
+        "min_cognitive_load": FATIGUE_MIN_COGNITIVE_LOAD,
+    })
     
     def __init__(self):
-        # History for temporal analysis
-        self.analysis_history: List[AnalysisResult] = []
+        # History for temporal analysis (last 100 results)
+        self.analysis_history: Deque[AnalysisResult] = deque(maxlen=100)
     
     def analyze(
         self, 
-        signals: List[SignalSnapshot],
+        signals: Union[SignalWindow, List[SignalSnapshot]],
         idle_seconds: float = 0.0
     ) -> AnalysisResult:
         """
         Analyze a batch of signals and return user state.
         
         Args:
-            signals: Recent SignalSnapshot objects
+            signals: Recent signals, as a SignalWindow or SignalSnapshot list
             idle_seconds: Seconds since last activity
         
         Returns:
             AnalysisResult with scores and recommendations
         """
+        if not isinstance(signals, SignalWindow):
+            signals = SignalWindow.from_snapshots(signals)
         
         # Need minimum signals for reliable analysis
         if len(signals) < 10:
@@ -119,20 +179,68 @@ class SignalAnalyzer:
                 idle_seconds=idle_seconds
             )
         
+        result = self._evaluate(signals, idle_seconds)
+        
+        # Store in history (deque drops the oldest entry itself)
+        self.analysis_history.append(result)
+        
+        return result
+    
+    def analyze_many(
+        self,
+        signals: List[SignalSnapshot],
+        batch_size: int = 20,
+        capacity: int = 1000
+    ) -> List[AnalysisResult]:
+        """
+        Replay a recorded stream of signals the way the daemon sees it.
+        
+        Signals are fed through a SignalBuffer and analyzed every
+        `batch_size` signals, like SignalCollector does. The buffer's
+        running statistics make each analysis O(1), so a replay costs
+        O(len(signals)) rather than one full window scan per result.
+        Useful for threshold calibration; does not touch analysis_history.
+        
+        Args:
+            signals: Recorded signals, oldest first
+            batch_size: Signals between analyses
+            capacity: Window size (the collector keeps 1000)
+        
+        Returns:
+            One AnalysisResult per batch
+        """
+        buffer = SignalBuffer(capacity=capacity)
+        results = []
+        
+        for i, s in enumerate(signals, 1):
+            buffer.append(s.timestamp, s.interval_ms, s.is_backspace, s.is_modifier)
+            if i % batch_size:
+                continue
+            
+            # Analysis runs right after a keystroke, so nothing is idle
+            if len(buffer) < 10:
+                results.append(self._create_default_result(confidence=0.1, idle_seconds=0.0))
+            else:
+                results.append(self._evaluate(buffer.window(), 0.0))
+        
+        return results
+    
+    def _evaluate(self, signals: SignalWindow, idle_seconds: float) -> AnalysisResult:
+        """Score a window of at least 10 signals."""
         # Calculate raw metrics
         typing_wpm = self._calculate_wpm(signals)
         backspace_ratio = self._calculate_backspace_ratio(signals)
         rhythm_variance = self._calculate_rhythm_variance(signals)
         
+        # Only a long enough window counts as sustained typing
+        typing_span = 0.0
+        if len(signals) >= 50:
+            typing_span = signals.timestamps[-1] - signals.timestamps[0]
+        
         # Calculate core scores
-        stress_level = self._calculate_stress(
-            typing_wpm, backspace_ratio, rhythm_variance
-        )
-        focus_level = self._calculate_focus(
-            signals, rhythm_variance, idle_seconds
-        )
-        cognitive_load = self._calculate_cognitive_load(
-            typing_wpm, backspace_ratio, rhythm_variance
+        stress_level, focus_level, cognitive_load = self._score(
+            typing_wpm, backspace_ratio, rhythm_variance,
+            typing_span, idle_seconds
         )
         
         # Determine state (v2: with Adrenaline/Fatigue detection)
@@ -145,9 +253,7 @@ class SignalAnalyzer:
         confidence = min(len(signals) / 100, 1.0)
         
         # Generate recommendations (v2: updated for new states)
-        response_style, avoid_questions, interruptible = self._generate_recommendations(
-            stress_level, focus_level, state
-        )
+        response_style, avoid_questions, interruptible = self._generate_recommendations(state)
         
         result = AnalysisResult(
             stress_level=stress_level,
@@ -164,14 +270,9 @@ class SignalAnalyzer:
             idle_seconds=idle_seconds
         )
         
-        # Store in history
-        self.analysis_history.append(result)
-        if len(self.analysis_history) > 100:
-            self.analysis_history.pop(0)
-        
         return result
     
-    def _calculate_wpm(self, signals: List[SignalSnapshot]) -> float:
+    def _calculate_wpm(self, signals: SignalWindow) -> float:
         """
         Estimate words per minute from keystroke intervals.
         Average word = 5 characters.
@@ -180,7 +281,7 @@ class SignalAnalyzer:
             return 0.0
         
         # Total time span
-        time_span = signals[-1].timestamp - signals[0].timestamp
+        time_span = signals.timestamps[-1] - signals.timestamps[0]
         if time_span <= 0:
             return 0.0
         
@@ -190,7 +291,7 @@ class SignalAnalyzer:
         
         return round(wpm, 1)
     
-    def _calculate_backspace_ratio(self, signals: List[SignalSnapshot]) -> float:
+    def _calculate_backspace_ratio(self, signals: SignalWindow) -> float:
         """
         Calculate ratio of backspaces to total keystrokes.
         High ratio = anxiety, perfectionism, or debugging.
@@ -198,110 +299,120 @@ class SignalAnalyzer:
         if not signals:
             return 0.0
         
-        backspace_count = sum(1 for s in signals if s.is_backspace)
+        if signals.stats is not None:
+            backspace_count = signals.stats.backspaces
+        else:
+            backspace_count = sum(signals.is_backspace)
         return backspace_count / len(signals)
     
-    def _calculate_rhythm_variance(self, signals: List[SignalSnapshot]) -> float:
+    def _calculate_rhythm_variance(self, signals: SignalWindow) -> float:
         """
         Calculate variance in inter-keystroke intervals.
         High variance = erratic, stressed, uncertain.
         Low variance = flow state, confident.
         """
-        intervals = [s.interval_ms for s in signals if s.interval_ms > 0 and s.interval_ms < 2000]
+        if signals.stats is not None:
+            # Kept up to date by the collector's buffer as signals come and go
+            n = signals.stats.interval_count
+            if n < 2:
+                return 0.0
+            return max(0.0, signals.stats.interval_m2 / (n - 1))
         
-        if len(intervals) < 2:
-            return 0.0
+        intervals = [iv for iv in signals.interval_ms if iv > 0 and iv < 2000]
         
-        try:
-            return statistics.variance(intervals)
-        except statistics.StatisticsError:
+        n = len(intervals)
+        if n < 2:
             return 0.0
+        
+        # Two-pass sample variance in plain floats (same as numpy's
+        # var(ddof=1)). statistics.variance does exact Fraction arithmetic,
+        # which made it ~10x slower than everything else in analyze().
+        mean = sum(intervals) / n
+        return sum((x - mean) * (x - mean) for x in intervals) / (n - 1)
     
-    def _calculate_stress(
-        self, 
-        wpm: float, 
-        backspace_ratio: float, 
-        variance: float
-    ) -> float:
+    def _score(
+        self,
+        wpm: float,
+        backspace_ratio: float,
+        variance: float,
+        typing_span: float,
+        idle_seconds: float
+    ) -> Tuple[float, float, float]:
         """
-        Calculate stress score (0.0 to 1.0).
+        Calculate (stress, focus, cognitive_load), each 0.0 to 1.0.
+        
+        All three scores are read off the same metrics, so they are
+        computed together and each metric is classified once.
         
         Stress indicators:
         - High typing velocity (rushing)
         - High backspace ratio (corrections/anxiety)
         - High rhythm variance (erratic behavior)
+        
+        Focus indicators:
+        - Sustained typing (no long pauses)
+        - Low rhythm variance (consistent flow)
+        - Recent activity (not idle)
+        
+        High cognitive load = user is overwhelmed, needs simpler responses.
+        
+        Args:
+            typing_span: Seconds covered by the window, or 0.0 if it holds
+                too few signals to count as sustained typing
         """
+        # One pass down the variance bands feeds all three scores:
+        # high variance = erratic (stress) / task-switching (load),
+        # low variance = flow state (focus)
+        stress_variance = focus_variance = 0.0
+        switching = False
+        if variance > STRESS_HIGH_VARIANCE:
+            stress_variance = 0.30
+            switching = True
+        elif variance > 8000:
+            stress_variance = 0.15
+            switching = True
+        elif variance > 5000:
+            stress_variance = 0.15
+        elif variance < FOCUS_LOW_VARIANCE:
+            focus_variance = 0.25
+        elif variance < 5000:
+            focus_variance = 0.10
+        
+        # --- Stress ---
         stress = 0.0
         
         # High WPM indicates rushing/stress
-        if wpm > self.STRESS_THRESHOLDS["high_wpm"]:
+        if wpm > STRESS_HIGH_WPM:
             stress += 0.35
         elif wpm > 60:
             stress += 0.15
         
         # High backspace ratio indicates anxiety/perfectionism
-        if backspace_ratio > self.STRESS_THRESHOLDS["high_backspace"]:
+        if backspace_ratio > STRESS_HIGH_BACKSPACE:
             stress += 0.35
         elif backspace_ratio > 0.10:
             stress += 0.15
         
-        # High variance indicates erratic behavior
-        if variance > self.STRESS_THRESHOLDS["high_variance"]:
-            stress += 0.30
-        elif variance > 5000:
-            stress += 0.15
-        
-        return min(stress, 1.0)
-    
-    def _calculate_focus(
-        self, 
-        signals: List[SignalSnapshot],
-        variance: float,
-        idle_seconds: float
-    ) -> float:
-        """
-        Calculate focus score (0.0 to 1.0).
+        stress += stress_variance
         
-        Focus indicators:
-        - Sustained typing (no long pauses)
-        - Low rhythm variance (consistent flow)
-        - Recent activity (not idle)
-        """
+        # --- Focus ---
         focus = 0.5  # Start neutral
         
         # Check for sustained typing
-        if len(signals) >= 50:
-            time_span = signals[-1].timestamp - signals[0].timestamp
-            if time_span > self.FOCUS_THRESHOLDS["sustained_typing"]:
-                focus += 0.25
-        
-        # Low variance = flow state
-        if variance < self.FOCUS_THRESHOLDS["low_variance"]:
+        if typing_span > FOCUS_SUSTAINED_TYPING:
             focus += 0.25
-        elif variance < 5000:
-            focus += 0.10
+        
+        focus += focus_variance
         
         # Penalize for being idle
         if idle_seconds > 60:
             focus -= 0.30
         elif idle_seconds > 30:
             focus -= 0.15
-        elif idle_seconds > self.FOCUS_THRESHOLDS["no_idle"]:
+        elif idle_seconds > FOCUS_NO_IDLE:
             focus -= 0.05
         
-        return max(0.0, min(focus, 1.0))
-    
-    def _calculate_cognitive_load(
-        self,
-        wpm: float,
-        backspace_ratio: float,
-        variance: float
-    ) -> float:
-        """
-        Calculate cognitive load (0.0 to 1.0).
-        
-        High cognitive load = user is overwhelmed, needs simpler responses.
-        """
+        # --- Cognitive load ---
         load = 0.3  # Baseline
         
         # High WPM + high backspace = problem-solving under pressure
@@ -309,14 +420,14 @@ class SignalAnalyzer:
             load += 0.35
         
         # High variance alone indicates task-switching
-        if variance > 8000:
+        if switching:
             load += 0.25
         
         # Very fast typing with corrections = debugging
         if wpm > 90 and backspace_ratio > 0.18:
             load += 0.20
         
-        return min(load, 1.0)
+        return min(stress, 1.0), max(0.0, min(focus, 1.0)), min(load, 1.0)
     
     def _determine_state(
         self,
@@ -344,16 +455,16 @@ class SignalAnalyzer:
         # NEW: ADRENALINE detection (High speed + Low errors + High focus)
         # This is the "P0 incident" or "Flow state" signature
         # We should NOT block commands in this state
-        if (wpm > self.ADRENALINE_THRESHOLDS["min_wpm"] and 
-            backspace_ratio < self.ADRENALINE_THRESHOLDS["max_backspace"] and
-            focus > self.ADRENALINE_THRESHOLDS["min_focus"]):
+        if (wpm > ADRENALINE_MIN_WPM and 
+            backspace_ratio < ADRENALINE_MAX_BACKSPACE and
+            focus > ADRENALINE_MIN_FOCUS):
             return UserState.ADRENALINE
         
         # NEW: FATIGUED detection (High load + High errors)
         # This is the "sloppy, dangerous" signature
         # We SHOULD block commands in this state
-        if (cognitive_load > self.FATIGUE_THRESHOLDS["min_cognitive_load"] and
-            backspace_ratio > self.FATIGUE_THRESHOLDS["min_backspace"]):
+        if (cognitive_load > FATIGUE_MIN_COGNITIVE_LOAD and
+            backspace_ratio > FATIGUE_MIN_BACKSPACE):
             return UserState.FATIGUED
         
         # High stress + high activity = debugging
@@ -375,12 +486,7 @@ class SignalAnalyzer:
         # Low everything = relaxed
         return UserState.RELAXED
     
-    def _generate_recommendations(
-        self,
-        stress: float,
-        focus: float,
-        state: UserState
-    ) -> tuple[str, bool, bool]:
+    def _generate_recommendations(self, state: UserState) -> Tuple[str, bool, bool]:
         """
         Generate recommendations for AI interaction.
         
@@ -389,35 +495,7 @@ class SignalAnalyzer:
         Returns:
             (response_style, avoid_clarifying_questions, interruptible)
         """
-        
-        # NEW: Adrenaline mode - user is "in the zone" or handling P0
-        # Be extremely concise, no chatter, just execute
-        if state == UserState.ADRENALINE:
-            return ("concise_command_mode", True, False)
-        
-        # NEW: Fatigued mode - user is making mistakes
-        # Be protective, double-check things, add friction
-        if state == UserState.FATIGUED:
-            return ("protective", True, False)
-        
-        if state == UserState.DEBUGGING:
-            # User is problem-solving under pressure
-            return ("concise", True, False)
-        
-        if state == UserState.STRESSED:
-            # User is stressed - be brief and direct
-            return ("concise", True, False)
-        
-        if state == UserState.FOCUSED:
-            # User is in flow - don't interrupt unnecessarily
-            return ("detailed", False, False)
-        
-        if state == UserState.WORKING:
-            # Normal working mode
-            return ("detailed", False, True)
-        
-        # Relaxed - full engagement OK
-        return ("friendly", False, True)
+        return _RECOMMENDATIONS[state]
     
     def _create_default_result(
         self,
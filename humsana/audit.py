@@ -3,24 +3,67 @@ Humsana - Audit Logger
 Logs safety overrides for compliance and post-mortems.
 
 Writes to:
-1. Local JSON file (~/.humsana/audit.json)
+1. Local log file (~/.humsana/audit.jsonl, one JSON event per line)
 2. Optional webhook (for Slack/PagerDuty/etc.)
 """
 
+import atexit
 import json
 import requests
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, TextIO
 from dataclasses import dataclass, asdict
 import os
 
 
+# Compact encoder for log lines, built once
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+# Emoji for each event type in webhook messages
+_EVENT_EMOJI = {
+    'safety_override': '🚨',
+    'command_blocked': '🛑',
+    'command_allowed': '✅',
+    'dangerous_command_allowed': '⚠️'
+}
+
+# Webhook message body, parsed once
+_WEBHOOK_TEXT = (
+    "{emoji} *Humsana Safety Event*\n\n"
+    "*Event:* {event}\n"
+    "*User:* {user}\n"
+    "*Command:* `{command}`\n"
+    "*Fatigue:* {fatigue_level}% ({fatigue_category})\n"
+    "*Uptime:* {uptime_hours:.1f} hours\n"
+    "*Outcome:* {outcome}\n"
+    "*Mode:* {mode}\n"
+    "{override}"
+    "*Timestamp:* {timestamp}\n"
+).format
+
+# Webhook delivery: one keep-alive session, posted from background threads
+_SESSION = requests.Session()
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='humsana-webhook')
+
+# Let queued posts go out before the process exits
+atexit.register(_POOL.shutdown, wait=True)
+
+
 def get_audit_path() -> Path:
-    """Get path to audit log file."""
+    """Get path to audit log file (one JSON event per line)."""
     humsana_dir = Path.home() / ".humsana"
     humsana_dir.mkdir(exist_ok=True)
-    return humsana_dir / "audit.json"
+    return humsana_dir / "audit.jsonl"
+
+
+def get_legacy_audit_path() -> Path:
+    """Get path to the pre-NDJSON audit file (read once for migration)."""
+    return Path.home() / ".humsana" / "audit.json"
 
 
 @dataclass
@@ -36,6 +79,7 @@ class AuditEntry:
     user: str
     outcome: str  # 'executed', 'blocked', 'simulated'
     mode: str  # 'dry_run', 'live'
+    epoch: float  # Same instant as `timestamp`, in seconds since the epoch
 
 
 class AuditLogger:
@@ -53,34 +97,125 @@ class AuditLogger:
     
     def __init__(self):
         self.audit_path = get_audit_path()
+        self._log_file: Optional[TextIO] = None
+        self._log_lines = 0  # Event lines currently in the log file
+        self._lock = threading.Lock()  # Appends may come from several threads
         self._load_entries()
+        
+        # Per-event-type totals over self.entries, kept current on append/trim
+        self._counts = Counter(e.get('event') for e in self.entries)
     
     def _load_entries(self) -> None:
         """Load entries from disk."""
-        if self.audit_path.exists():
-            try:
-                with open(self.audit_path, 'r') as f:
-                    data = json.load(f)
-                    self.entries = data.get('entries', [])
-            except (json.JSONDecodeError, KeyError):
-                self.entries = []
-        else:
+        self.entries = []
+        
+        if not self.audit_path.exists():
+            self._migrate_legacy_file()
+            return
+        
+        # Only the newest MAX_ENTRIES survive; older lines are dropped as we go
+        entries = deque(maxlen=self.MAX_ENTRIES)
+        line = "\n"
+        with open(self.audit_path, 'r') as f:
+            for line in f:
+                self._log_lines += 1
+                try:
+                    entries.append(self._with_epoch(json.loads(line)))
+                except (json.JSONDecodeError, KeyError, ValueError):
+                    # Torn or corrupt line (e.g. crash mid-append) - skip it
+                    continue
+        self.entries = list(entries)
+        
+        # A torn final line would swallow the next append; rewrite it away
+        if not line.endswith("\n"):
+            self._compact()
+    
+    def _migrate_legacy_file(self) -> None:
+        """Import entries from the old single-document audit.json."""
+        legacy_path = get_legacy_audit_path()
+        if not legacy_path.exists():
+            return
+        
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+                self.entries = [
+                    self._with_epoch(e)
+                    for e in data.get('entries', [])[-self.MAX_ENTRIES:]
+                ]
+        except (json.JSONDecodeError, KeyError, ValueError):
             self.entries = []
+            return
+        
+        self._compact()
+    
+    @staticmethod
+    def _with_epoch(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make sure a stored entry has `epoch`, so time filters compare floats.
+        Entries written before `epoch` existed only have the ISO string.
+        """
+        if 'epoch' not in entry:
+            entry['epoch'] = datetime.fromisoformat(entry['timestamp']).timestamp()
+        return entry
+    
+    def _append_entry(self, entry: Dict[str, Any]) -> None:
+        """
+        Append one entry to the log.
+        
+        O(1) per event: written and flushed straight away (audit events
+        are rare and must survive a crash), and the file is only rewritten
+        by _compact() once it holds MAX_ENTRIES lines of dead weight.
+        """
+        with self._lock:
+            self._append_locked(entry)
     
-    def _save_entries(self) -> None:
-        """Save entries to disk."""
-        # Trim to MAX_ENTRIES (keep most recent)
+    def _append_locked(self, entry: Dict[str, Any]) -> None:
+        """_append_entry() body; caller holds self._lock."""
+        self.entries.append(entry)
+        self._counts[entry['event']] += 1
         if len(self.entries) > self.MAX_ENTRIES:
-            self.entries = self.entries[-self.MAX_ENTRIES:]
+            # Trim to MAX_ENTRIES (keep most recent)
+            for dropped in self.entries[:-self.MAX_ENTRIES]:
+                self._counts[dropped.get('event')] -= 1
+            del self.entries[:-self.MAX_ENTRIES]
         
-        data = {
-            'entries': self.entries,
-            'last_updated': datetime.now().isoformat(),
-            'total_count': len(self.entries)
-        }
+        log_file = self._log_handle()
+        log_file.write(_encode(entry) + "\n")
+        log_file.flush()
+        self._log_lines += 1
         
-        with open(self.audit_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        if self._log_lines - len(self.entries) >= self.MAX_ENTRIES:
+            self._compact()
+    
+    def _log_handle(self) -> TextIO:
+        """
+        The append handle for the log. Reopened by path if another process
+        (the CLI or MCP server) has compacted the file since, as appends to
+        the replaced inode would be lost without an error.
+        """
+        if self._log_file is not None:
+            try:
+                if (os.fstat(self._log_file.fileno()).st_ino
+                        == os.stat(self.audit_path).st_ino):
+                    return self._log_file
+            except FileNotFoundError:
+                pass
+            self._log_file.close()
+        self._log_file = open(self.audit_path, 'a')
+        return self._log_file
+    
+    def _compact(self) -> None:
+        """Rewrite the log with only the retained entries."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        
+        tmp_path = self.audit_path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'w') as f:
+            f.writelines(_encode(entry) + "\n" for entry in self.entries)
+        os.replace(tmp_path, self.audit_path)
+        self._log_lines = len(self.entries)
     
     def log_event(
         self,
@@ -111,9 +246,10 @@ class AuditLogger:
         Returns:
             The created AuditEntry
         """
+        now = time.time()
         entry = AuditEntry(
             event=event,
-            timestamp=datetime.now().isoformat(),
+            timestamp=datetime.fromtimestamp(now).isoformat(),
             command=command,
             fatigue_level=fatigue_level,
             fatigue_category=fatigue_category,
@@ -121,12 +257,12 @@ class AuditLogger:
             override_reason=override_reason,
             user=os.environ.get('USER', 'unknown'),
             outcome=outcome,
-            mode=mode
+            mode=mode,
+            epoch=now
         )
         
         # Add to local log
-        self.entries.append(asdict(entry))
-        self._save_entries()
+        self._append_entry(asdict(entry))
         
         # Fire webhook if configured
         if webhook_url:
@@ -138,16 +274,21 @@ class AuditLogger:
         """
         POST the event to a webhook (Slack, PagerDuty, etc.)
         
-        Fire-and-forget: doesn't block on failure.
+        Fire-and-forget: the POST runs on a background thread, so the
+        user's command never waits on the network.
         """
+        # Format for Slack-compatible webhook
+        payload = self._format_webhook_payload(entry)
+        _POOL.submit(self._post_webhook, webhook_url, payload)
+    
+    @staticmethod
+    def _post_webhook(webhook_url: str, payload: Dict[str, Any]) -> None:
+        """Deliver a webhook payload (runs on the webhook pool)."""
         try:
-            # Format for Slack-compatible webhook
-            payload = self._format_webhook_payload(entry)
-            
-            requests.post(
+            _SESSION.post(
                 webhook_url,
                 json=payload,
-                timeout=5,  # Don't hang the user's command
+                timeout=5,
                 headers={'Content-Type': 'application/json'}
             )
         except Exception:
@@ -160,42 +301,31 @@ class AuditLogger:
         
         Returns a Slack-compatible message payload.
         """
-        # Choose emoji based on event type
-        emoji_map = {
-            'safety_override': '🚨',
-            'command_blocked': '🛑',
-            'command_allowed': '✅',
-            'dangerous_command_allowed': '⚠️'
-        }
-        emoji = emoji_map.get(entry.event, '📋')
-        
-        # Build the message
-        text = f"{emoji} *Humsana Safety Event*\n\n"
-        text += f"*Event:* {entry.event}\n"
-        text += f"*User:* {entry.user}\n"
-        text += f"*Command:* `{entry.command[:100]}...`\n" if len(entry.command) > 100 else f"*Command:* `{entry.command}`\n"
-        text += f"*Fatigue:* {entry.fatigue_level}% ({entry.fatigue_category})\n"
-        text += f"*Uptime:* {entry.uptime_hours:.1f} hours\n"
-        text += f"*Outcome:* {entry.outcome}\n"
-        text += f"*Mode:* {entry.mode}\n"
+        command = entry.command
+        if len(command) > 100:
+            command = command[:100] + "..."
         
+        override = ""
         if entry.override_reason:
-            text += f"*Override Reason:* {entry.override_reason}\n"
+            override = f"*Override Reason:* {entry.override_reason}\n"
         
-        text += f"*Timestamp:* {entry.timestamp}\n"
+        text = _WEBHOOK_TEXT(
+            emoji=_EVENT_EMOJI.get(entry.event, '📋'),
+            event=entry.event,
+            user=entry.user,
+            command=command,
+            fatigue_level=entry.fatigue_level,
+            fatigue_category=entry.fatigue_category,
+            uptime_hours=entry.uptime_hours,
+            outcome=entry.outcome,
+            mode=entry.mode,
+            override=override,
+            timestamp=entry.timestamp
+        )
         
-        return {
-            "text": text,
-            "blocks": [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": text
-                    }
-                }
-            ]
-        }
+        # Slack renders top-level text as mrkdwn; a section block
+        # repeating the same text adds nothing
+        return {"text": text}
     
     def get_recent_events(self, count: int = 10) -> List[Dict]:
         """Get the N most recent events."""
@@ -203,10 +333,11 @@ class AuditLogger:
     
     def get_overrides_since(self, since: datetime) -> List[Dict]:
         """Get all safety overrides since a given datetime."""
+        since_epoch = since.timestamp()
         return [
             e for e in self.entries
             if e['event'] == 'safety_override'
-            and datetime.fromisoformat(e['timestamp']) > since
+            and e['epoch'] > since_epoch
         ]
     
     def get_stats(self) -> Dict[str, Any]:
@@ -221,9 +352,9 @@ class AuditLogger:
         
         return {
             'total_events': len(self.entries),
-            'overrides': sum(1 for e in self.entries if e['event'] == 'safety_override'),
-            'blocks': sum(1 for e in self.entries if e['event'] == 'command_blocked'),
-            'allowed': sum(1 for e in self.entries if e['event'] in ('command_allowed', 'dangerous_command_allowed')),
+            'overrides': self._counts['safety_override'],
+            'blocks': self._counts['command_blocked'],
+            'allowed': self._counts['command_allowed'] + self._counts['dangerous_command_allowed'],
             'oldest_entry': self.entries[0]['timestamp'] if self.entries else None,
             'newest_entry': self.entries[-1]['timestamp'] if self.entries else None
         }
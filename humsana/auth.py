@@ -1,18 +1,16 @@
 """
 Humsana Auth - Localhost Loopback OAuth Flow
-Uses a temp file for cross-thread signaling (most reliable method).
+The callback handler hands the token to the waiting main thread in memory
+via a threading.Event - it never touches disk.
 """
 
 import webbrowser
 import http.server
-import socketserver
 import urllib.parse
 import threading
-import tempfile
 import time
 import os
-import json
-from pathlib import Path
+import dataclasses
 from typing import Optional
 
 from .config import load_config, save_config, get_config_path
@@ -25,8 +23,14 @@ AUTH_BASE_URL = "https://humsana-auth-relay.vercel.app"
 REDIRECT_PORT = 3649
 AUTH_TIMEOUT = 120
 
-# Temp file for passing token from handler to main thread
-_TOKEN_FILE = Path(tempfile.gettempdir()) / "humsana_oauth_result.json"
+
+class _AuthResult:
+    """Outcome of one OAuth flow, filled in by the callback handler."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.token: Optional[str] = None
+        self.error: Optional[str] = None
 
 
 # ============================================================
@@ -40,16 +44,18 @@ class OAuthCallbackHandler(http.server.BaseHTTPRequestHandler):
         parsed = urllib.parse.urlparse(self.path)
         params = urllib.parse.parse_qs(parsed.query)
         
+        # Shared with authenticate_slack(), which waits on result.done
+        result: _AuthResult = self.server.auth_result
+        
         if 'token' in params:
-            token = params['token'][0]
-            # Write token to temp file (main thread will read it)
-            _TOKEN_FILE.write_text(json.dumps({"token": token}))
+            result.token = params['token'][0]
             self._send_success_page()
+            result.done.set()
                 
         elif 'error' in params:
-            error = params.get('error', ['Unknown error'])[0]
-            _TOKEN_FILE.write_text(json.dumps({"error": error}))
-            self._send_error_page(error)
+            result.error = params.get('error', ['Unknown error'])[0]
+            self._send_error_page(result.error)
+            result.done.set()
         else:
             self.send_error(400, "Invalid callback")
     
@@ -99,29 +105,19 @@ def authenticate_slack() -> bool:
             return False
         print()
     
-    # Clean up any old token file
-    if _TOKEN_FILE.exists():
-        _TOKEN_FILE.unlink()
-    
     # Create server
     print("📡 Starting local authentication server...")
     
     try:
-        socketserver.TCPServer.allow_reuse_address = True
-        server = socketserver.TCPServer(("127.0.0.1", REDIRECT_PORT), OAuthCallbackHandler)
-        server.timeout = 1
+        # HTTPServer already sets allow_reuse_address
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", REDIRECT_PORT), OAuthCallbackHandler)
+        server.auth_result = _AuthResult()
     except OSError as e:
         print(f"❌ Could not start server: {e}")
         return False
     
-    # Run server in background
-    stop_server = threading.Event()
-    
-    def serve():
-        while not stop_server.is_set():
-            server.handle_request()
-    
-    server_thread = threading.Thread(target=serve, daemon=True)
+    # Run server in background (sleeps in select() until a request or shutdown())
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
     server_thread.start()
     
     # Open browser
@@ -140,38 +136,30 @@ def authenticate_slack() -> bool:
     print("   (Press Ctrl+C to cancel)")
     print()
     
-    # Poll for token file
-    token = None
-    error = None
-    start_time = time.time()
-    
+    # Wait for the callback (wakes as soon as the handler sets the event).
+    # Short slices, because an untimed lock wait can't be interrupted by
+    # Ctrl+C on Windows.
     try:
-        while time.time() - start_time < AUTH_TIMEOUT:
-            if _TOKEN_FILE.exists():
-                try:
-                    data = json.loads(_TOKEN_FILE.read_text())
-                    token = data.get("token")
-                    error = data.get("error")
-                    break
-                except:
-                    pass
-            time.sleep(0.3)
+        deadline = time.monotonic() + AUTH_TIMEOUT
+        while not server.auth_result.done.wait(0.5):
+            if time.monotonic() >= deadline:
+                break
     except KeyboardInterrupt:
         print("\n❌ Cancelled.")
-        stop_server.set()
         server.shutdown()
+        server.server_close()
         return False
     
     # Cleanup
-    stop_server.set()
     try:
         server.shutdown()
+        server.server_close()
     except:
         pass
-    if _TOKEN_FILE.exists():
-        _TOKEN_FILE.unlink()
     
     # Handle result
+    token = server.auth_result.token
+    error = server.auth_result.error
     if error:
         print(f"❌ Failed: {error}")
         return False
@@ -185,8 +173,7 @@ def authenticate_slack() -> bool:
         return False
     
     # Save
-    config.slack_user_token = token
-    save_config(config)
+    save_config(dataclasses.replace(config, slack_user_token=token))
     
     print("=" * 50)
     print("✅ Slack connected successfully!")
@@ -205,8 +192,7 @@ def disconnect_slack() -> bool:
         print("ℹ️  Slack is not connected.")
         return False
     
-    config.slack_user_token = None
-    save_config(config)
+    save_config(dataclasses.replace(config, slack_user_token=None))
     
     print("✅ Slack disconnected.")
     return True
@@ -12,10 +12,10 @@ See lines 45-70 for the exact privacy implementation.
 """
 
 from pynput import keyboard, mouse
-from collections import deque
+from array import array
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional, Callable
+from typing import Optional, Callable, List
+import queue
 import time
 import threading
 
@@ -26,12 +26,219 @@ class SignalSnapshot:
     A privacy-safe snapshot of typing behavior.
     Contains ONLY timing data, never key content.
     """
-    timestamp: float
+    __slots__ = ("timestamp", "interval_ms", "is_backspace", "is_modifier")
+    
+    timestamp: float    # time.monotonic() seconds; only differences are meaningful
     interval_ms: float  # Time since last keystroke
     is_backspace: bool  # Only track if it was a correction
     is_modifier: bool   # Shift, Ctrl, Alt, Cmd
 
 
+@dataclass
+class WindowStats:
+    """
+    Running totals for a window, kept up to date by SignalBuffer as
+    signals arrive and expire so the analyzer doesn't rescan the window.
+    """
+    __slots__ = ("backspaces", "interval_count", "interval_mean", "interval_m2")
+    
+    backspaces: int
+    
+    # Welford accumulators over the rhythm intervals (0 < interval_ms < 2000)
+    interval_count: int
+    interval_mean: float
+    interval_m2: float
+
+
+@dataclass
+class SignalWindow:
+    """
+    A chronological run of signals stored column-wise (one array per field).
+    This is what the analyzer works on - no per-keystroke objects.
+    """
+    timestamps: array    # 'd'
+    interval_ms: array   # 'd'
+    is_backspace: array  # 'B', 0/1
+    is_modifier: array   # 'B', 0/1
+    stats: Optional[WindowStats] = None  # Precomputed totals, if available
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @classmethod
+    def from_snapshots(cls, signals: List[SignalSnapshot]) -> "SignalWindow":
+        """Build a window from a list of SignalSnapshot objects."""
+        return cls(
+            timestamps=array('d', [s.timestamp for s in signals]),
+            interval_ms=array('d', [s.interval_ms for s in signals]),
+            is_backspace=array('B', [s.is_backspace for s in signals]),
+            is_modifier=array('B', [s.is_modifier for s in signals])
+        )
+
+
+class SignalBuffer:
+    """
+    Fixed-size ring buffer of signals, stored as parallel arrays.
+    
+    Appends write four array slots in place; window() copies the columns
+    out with C-level slicing, so no per-keystroke objects are kept.
+    
+    Storage is rounded up to a power of two so the write index wraps with
+    a mask; only the newest `capacity` signals are ever handed out.
+    
+    The buffer also maintains WindowStats for its full contents: each
+    append adds the new signal and removes the one it pushes out, so a full
+    window's statistics cost O(1) instead of a pass over every signal.
+    """
+    
+    # Rhythm intervals outside (0, RHYTHM_MAX_MS) are pauses, not typing
+    # (the same filter SignalAnalyzer applies when it scans a window)
+    RHYTHM_MAX_MS = 2000
+    
+    # Recompute the running sums from scratch after this many evictions,
+    # so floating-point error from the subtractive updates can't build up
+    RESYNC_EVERY = 4096
+    
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        size = 1 << max(capacity - 1, 0).bit_length()
+        self._mask = size - 1
+        self.timestamps = array('d', bytes(8 * size))
+        self.interval_ms = array('d', bytes(8 * size))
+        self.is_backspace = array('B', bytes(size))
+        self.is_modifier = array('B', bytes(size))
+        self._next = 0   # Slot the next signal is written to
+        self._count = 0  # Number of valid slots
+        
+        # Running statistics over the valid slots (see WindowStats)
+        self._backspaces = 0
+        self._iv_count = 0
+        self._iv_mean = 0.0
+        self._iv_m2 = 0.0
+        self._evictions = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(
+        self,
+        timestamp: float,
+        interval_ms: float,
+        is_backspace: bool,
+        is_modifier: bool
+    ) -> None:
+        """Store one signal, overwriting the oldest once full."""
+        i = self._next
+        
+        if self._count == self.capacity:
+            self._evict((i - self.capacity) & self._mask)
+        else:
+            self._count += 1
+        
+        if is_backspace:
+            self._backspaces += 1
+        if 0 < interval_ms < self.RHYTHM_MAX_MS:
+            # Welford update
+            self._iv_count += 1
+            delta = interval_ms - self._iv_mean
+            self._iv_mean += delta / self._iv_count
+            self._iv_m2 += delta * (interval_ms - self._iv_mean)
+        
+        self.timestamps[i] = timestamp
+        self.interval_ms[i] = interval_ms
+        self.is_backspace[i] = is_backspace
+        self.is_modifier[i] = is_modifier
+        
+        self._next = (i + 1) & self._mask
+        
+        if self._evictions >= self.RESYNC_EVERY:
+            self._resync()
+    
+    def _evict(self, i: int) -> None:
+        """Remove the signal in slot `i` from the running statistics."""
+        self._evictions += 1
+        
+        if self.is_backspace[i]:
+            self._backspaces -= 1
+        
+        interval_ms = self.interval_ms[i]
+        if 0 < interval_ms < self.RHYTHM_MAX_MS:
+            # Welford update, run backwards
+            n = self._iv_count - 1
+            if n == 0:
+                self._iv_mean = self._iv_m2 = 0.0
+            else:
+                delta = interval_ms - self._iv_mean
+                self._iv_mean -= delta / n
+                self._iv_m2 -= delta * (interval_ms - self._iv_mean)
+            self._iv_count = n
+    
+    def _resync(self) -> None:
+        """Recompute the interval statistics exactly from the stored signals."""
+        self._evictions = 0
+        
+        w = self.window()
+        intervals = [iv for iv in w.interval_ms if 0 < iv < self.RHYTHM_MAX_MS]
+        n = len(intervals)
+        mean = sum(intervals) / n if n else 0.0
+        
+        self._iv_count = n
+        self._iv_mean = mean
+        self._iv_m2 = sum((x - mean) * (x - mean) for x in intervals)
+    
+    def window(self, count: Optional[int] = None) -> SignalWindow:
+        """
+        Copy out the most recent `count` signals (default: all), oldest first.
+        A window of the whole buffer carries its WindowStats along.
+        """
+        n = self._count if count is None else min(count, self._count)
+        start = (self._next - n) & self._mask
+        end = start + n
+        
+        if end <= self._mask + 1:
+            columns = [
+                a[start:end] for a in (
+                    self.timestamps, self.interval_ms,
+                    self.is_backspace, self.is_modifier
+                )
+            ]
+        else:
+            # Wrapped around: stitch the tail and head together
+            end &= self._mask
+            columns = [
+                a[start:] + a[:end] for a in (
+                    self.timestamps, self.interval_ms,
+                    self.is_backspace, self.is_modifier
+                )
+            ]
+        
+        stats = None
+        if n == self._count:
+            stats = WindowStats(
+                backspaces=self._backspaces,
+                interval_count=self._iv_count,
+                interval_mean=self._iv_mean,
+                interval_m2=self._iv_m2
+            )
+        
+        return SignalWindow(*columns, stats=stats)
+    
+    def snapshots(self, count: Optional[int] = None) -> List[SignalSnapshot]:
+        """The most recent `count` signals as SignalSnapshot objects."""
+        w = self.window(count)
+        return [
+            SignalSnapshot(
+                timestamp=t,
+                interval_ms=iv,
+                is_backspace=bool(bs),
+                is_modifier=bool(mod)
+            )
+            for t, iv, bs, mod in zip(
+                w.timestamps, w.interval_ms, w.is_backspace, w.is_modifier
+            )
+        ]
+
+
 class SignalCollector:
     """
     Collects behavioral signals from keyboard and mouse.
@@ -42,19 +249,40 @@ class SignalCollector:
     - The actual key character is NEVER stored or transmitted
     """
     
+    # Key categories, built once instead of per keystroke. Key members
+    # compare by identity (and KeyCode never equals a Key), so identity and
+    # set membership give the same answers as the == checks they replace.
+    _BACKSPACE_KEY = keyboard.Key.backspace
+    _MODIFIER_KEYS = frozenset({
+        keyboard.Key.shift, keyboard.Key.shift_r,
+        keyboard.Key.ctrl, keyboard.Key.ctrl_r,
+        keyboard.Key.alt, keyboard.Key.alt_r,
+        keyboard.Key.cmd, keyboard.Key.cmd_r
+    })
+    
+    # Windows waiting for the batch callback beyond this are dropped, oldest
+    # first - each window holds the whole buffer, so a newer one supersedes
+    # it, and a stalled analyzer can't make the backlog grow without bound
+    MAX_PENDING_BATCHES = 4
+    
     def __init__(self, on_signal_batch: Optional[Callable] = None):
         # Rolling buffer of recent signals (last 1000)
-        self.signals: deque[SignalSnapshot] = deque(maxlen=1000)
+        self.signals = SignalBuffer(capacity=1000)
         
         # Timing tracking
         self.last_key_time: Optional[float] = None
-        self.session_start: float = time.time()
+        self.session_start: float = time.monotonic()
         
         # Callback when we have enough signals to analyze
         self.on_signal_batch = on_signal_batch
         self.batch_size = 20  # Analyze every 20 keystrokes
         self.batch_count = 0
         
+        # Windows are handed to a worker thread that runs on_signal_batch,
+        # so a slow analysis never holds up the input listener
+        self._batch_q: "queue.SimpleQueue[Optional[SignalWindow]]" = queue.SimpleQueue()
+        self._batch_thread: Optional[threading.Thread] = None
+        
         # Listeners (will be started by start())
         self._keyboard_listener: Optional[keyboard.Listener] = None
         self._mouse_listener: Optional[mouse.Listener] = None
@@ -75,7 +303,7 @@ class SignalCollector:
         - The actual key value is checked but NEVER stored
         - After this function, the key object is garbage collected
         """
-        now = time.time()
+        now = time.monotonic()
         
         # Calculate interval since last keystroke
         interval_ms = 0.0
@@ -84,25 +312,12 @@ class SignalCollector:
         
         # Detect key TYPE only (not content)
         # We check the key to categorize, then discard it
-        is_backspace = (key == keyboard.Key.backspace)
-        is_modifier = key in (
-            keyboard.Key.shift, keyboard.Key.shift_r,
-            keyboard.Key.ctrl, keyboard.Key.ctrl_r,
-            keyboard.Key.alt, keyboard.Key.alt_r,
-            keyboard.Key.cmd, keyboard.Key.cmd_r
-        )
-        
-        # Create privacy-safe signal
-        # NOTE: 'key' is NOT stored in SignalSnapshot
-        signal = SignalSnapshot(
-            timestamp=now,
-            interval_ms=interval_ms,
-            is_backspace=is_backspace,
-            is_modifier=is_modifier
-        )
+        is_backspace = key is self._BACKSPACE_KEY
+        is_modifier = key in self._MODIFIER_KEYS
         
-        # Store the signal (key object goes out of scope here)
-        self.signals.append(signal)
+        # Store the privacy-safe signal (key object goes out of scope here)
+        # NOTE: 'key' is NOT stored in the signal buffer
+        self.signals.append(now, interval_ms, is_backspace, is_modifier)
         self.last_key_time = now
         
         # Trigger batch analysis
@@ -110,12 +325,31 @@ class SignalCollector:
         if self.batch_count >= self.batch_size and self.on_signal_batch:
             self.batch_count = 0
             # Pass a copy of recent signals for analysis
-            self.on_signal_batch(list(self.signals))
+            batch_q = self._batch_q
+            batch_q.put_nowait(self.signals.window())
+            if batch_q.qsize() > self.MAX_PENDING_BATCHES:
+                try:
+                    batch_q.get_nowait()
+                except queue.Empty:
+                    pass  # The worker took it first
     
     # =========================================================
     # END PRIVACY-CRITICAL SECTION
     # =========================================================
     
+    def _drain_batches(self) -> None:
+        """Worker thread: run the batch callback on queued windows until stopped."""
+        get = self._batch_q.get
+        while True:
+            window = get()
+            if window is None:  # Sentinel from stop()
+                return
+            try:
+                self.on_signal_batch(window)
+            except Exception as e:
+                # Keep the worker alive; the next batch gets a fresh try
+                print(f"⚠️ Signal analysis failed: {e}")
+    
     def _on_key_release(self, key) -> None:
         """Handle key release - currently unused but available for future."""
         pass
@@ -127,11 +361,11 @@ class SignalCollector:
         """
         if pressed:
             # Just update activity timestamp
-            self.last_key_time = time.time()
+            self.last_key_time = time.monotonic()
     
     def _on_mouse_scroll(self, x: int, y: int, dx: int, dy: int) -> None:
         """Track scroll activity for focus detection."""
-        self.last_key_time = time.time()
+        self.last_key_time = time.monotonic()
     
     def start(self) -> None:
         """Start collecting signals."""
@@ -140,6 +374,14 @@ class SignalCollector:
         
         self._running = True
         
+        if self.on_signal_batch:
+            self._batch_thread = threading.Thread(
+                target=self._drain_batches,
+                name='humsana-analysis',
+                daemon=True
+            )
+            self._batch_thread.start()
+        
         # Start keyboard listener
         self._keyboard_listener = keyboard.Listener(
             on_press=self._on_key_press,
@@ -169,19 +411,30 @@ class SignalCollector:
             self._mouse_listener.stop()
             self._mouse_listener = None
         
+        # Let the batch in progress finish, so its result is delivered
+        # before the caller tears down; windows still queued are discarded
+        if self._batch_thread:
+            while True:
+                try:
+                    self._batch_q.get_nowait()
+                except queue.Empty:
+                    break
+            self._batch_q.put(None)
+            self._batch_thread.join(timeout=5)
+            self._batch_thread = None
+        
         print("⏹️ Humsana collector stopped")
     
     def get_recent_signals(self, count: int = 100) -> list[SignalSnapshot]:
         """Get the most recent signals for analysis."""
-        signals_list = list(self.signals)
-        return signals_list[-count:] if len(signals_list) > count else signals_list
+        return self.signals.snapshots(count)
     
     def get_session_duration_seconds(self) -> float:
         """How long has this session been running?"""
-        return time.time() - self.session_start
+        return time.monotonic() - self.session_start
     
     def get_idle_seconds(self) -> float:
         """How long since last activity?"""
         if self.last_key_time is None:
             return 0.0
-        return time.time() - self.last_key_time
\ No newline at end of file
+        return time.monotonic() - self.last_key_time
\ No newline at end of file
@@ -7,30 +7,41 @@ v2.0.0: Added webhook_type, webhook_key for PagerDuty/OpsGenie support
 
 import os
 import json
-import yaml
-import requests
+import functools
+import hashlib
+import threading
+import time
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field, fields
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timezone
 
 
 # ============================================================
 # PATHS
 # ============================================================
 
-def get_config_path() -> Path:
-    """Get path to config file."""
+@functools.lru_cache(maxsize=1)
+def _humsana_dir() -> Path:
+    """~/.humsana, created on the first call only (later calls skip the mkdir)."""
     humsana_dir = Path.home() / ".humsana"
     humsana_dir.mkdir(exist_ok=True)
-    return humsana_dir / "config.yaml"
+    return humsana_dir
+
+
+def get_config_path() -> Path:
+    """Get path to config file."""
+    return _humsana_dir() / "config.yaml"
 
 
 def get_humsana_dir() -> Path:
     """Get the Humsana data directory."""
-    humsana_dir = Path.home() / ".humsana"
-    humsana_dir.mkdir(exist_ok=True)
-    return humsana_dir
+    return _humsana_dir()
+
+
+def get_config_cache_path() -> Path:
+    """Get path to the parsed-config cache (see _read_config_data)."""
+    return _humsana_dir() / "config_cache.json"
 
 
 def get_license_path() -> Path:
@@ -43,6 +54,23 @@ def get_license_cache_path() -> Path:
     return get_humsana_dir() / "license_cache.json"
 
 
+@functools.lru_cache(maxsize=1)
+def _yaml() -> Tuple[Any, Any, Any]:
+    """
+    (yaml module, loader, dumper), imported on first use so commands that
+    never parse or write the config don't pay for importing PyYAML.
+    
+    libyaml's C loader/dumper when PyYAML was built with it (same results,
+    roughly 6-10x faster), otherwise the pure-Python ones.
+    """
+    import yaml
+    return (
+        yaml,
+        getattr(yaml, 'CSafeLoader', yaml.SafeLoader),
+        getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    )
+
+
 # License API endpoint
 LICENSE_API_URL = os.getenv("HUMSANA_LICENSE_API", "https://humsana.com/license/verify")
 
@@ -82,9 +110,74 @@ class LicenseInfo:
     cached: bool = False
 
 
+# verify_license() reuses its answer for this long (seconds) within a process
+LICENSE_RECHECK_SECONDS = 3600
+
+# ...except when the server couldn't give one (offline, or an error
+# response): that answer is only reused this long, so a Pro user who
+# started offline isn't held on the free tier for an hour
+LICENSE_RETRY_SECONDS = 60
+
+# Reasons for those server-less answers
+_REASON_OFFLINE = "Unable to verify (offline)"
+_REASON_SERVER_ERROR = "Verification failed"
+_TRANSIENT_REASONS = frozenset({_REASON_OFFLINE, _REASON_SERVER_ERROR})
+
+# Last verify_license() result: (time.monotonic() it expires at, license
+# file mtime_ns or None if missing, result)
+_license_result: Optional[Tuple[float, Optional[int], LicenseInfo]] = None
+
+# Bumped (under _refresh_lock) when a background re-check lands a fresh
+# answer, so a verify_license() that started before it can't store the
+# stale one over it
+_license_generation = 0
+
+
 def verify_license() -> LicenseInfo:
-    """Verify the license key."""
+    """
+    Verify the license key.
+    
+    The result is shared process-wide and reused for up to
+    LICENSE_RECHECK_SECONDS (LICENSE_RETRY_SECONDS if the server couldn't
+    be asked), or until the license file changes, so repeated checks
+    don't re-read the cache file or hit the network.
+    """
+    global _license_result
     license_path = get_license_path()
+    
+    try:
+        mtime = license_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    
+    now = time.monotonic()
+    if (_license_result is not None and _license_result[1] == mtime
+            and now < _license_result[0]):
+        return _license_result[2]
+    
+    generation = _license_generation
+    info = _verify_license(license_path)
+    ttl = LICENSE_RETRY_SECONDS if info.reason in _TRANSIENT_REASONS else LICENSE_RECHECK_SECONDS
+    with _refresh_lock:
+        if generation == _license_generation:
+            _license_result = (now + ttl, mtime, info)
+    return info
+
+
+# Cached server answers are trusted for LICENSE_GRACE_SECONDS without asking
+# again; older ones (up to LICENSE_OFFLINE_GRACE_SECONDS) are still honoured
+# while a re-check runs in the background
+LICENSE_GRACE_SECONDS = 7 * 86400
+LICENSE_OFFLINE_GRACE_SECONDS = 30 * 86400
+
+# Guards against starting a second background re-check while one runs,
+# and guards _license_result / _license_generation updates
+_refresh_lock = threading.Lock()
+_refreshing = False
+
+
+def _verify_license(license_path: Path) -> LicenseInfo:
+    """Check the license key against the local cache, then the server."""
     cache_path = get_license_cache_path()
     
     if not license_path.exists():
@@ -95,79 +188,138 @@ def verify_license() -> LicenseInfo:
     if not license_key or not license_key.startswith("hum_pro_"):
         return LicenseInfo(valid=False, tier="free", reason="Invalid license format")
     
-    # Check cache first (offline grace period: 7 days)
-    if cache_path.exists():
-        try:
-            cache = json.loads(cache_path.read_text())
-            verified_at = datetime.fromisoformat(cache["verified_at"])
-            grace_period = timedelta(days=7)
-            
-            if datetime.utcnow() - verified_at < grace_period and cache.get("valid"):
-                return LicenseInfo(
-                    valid=True,
-                    tier=cache.get("tier", "pro"),
-                    expires_at=cache.get("expires_at"),
-                    cached=True
-                )
-        except (json.JSONDecodeError, KeyError, ValueError):
-            pass
-    
-    # Verify with server
-    try:
-        response = requests.post(
-            LICENSE_API_URL,
-            json={"license_key": license_key},
-            timeout=5
-        )
-        
-        if response.ok:
-            data = response.json()
-            
-            cache = {
-                "valid": data.get("valid", False),
-                "tier": data.get("tier", "pro"),
-                "verified_at": datetime.utcnow().isoformat(),
-                "expires_at": data.get("expires_at")
-            }
-            cache_path.write_text(json.dumps(cache, indent=2))
-            
+    # Check cache first (offline grace period: 7 days, extended to 30)
+    cached = _read_license_cache(cache_path)
+    if cached is not None:
+        age, cache = cached
+        if cache.get("valid") and age < LICENSE_OFFLINE_GRACE_SECONDS:
+            if age >= LICENSE_GRACE_SECONDS:
+                # Stale: answer from the cache now, re-verify off the caller's path
+                _refresh_in_background(license_key, cache_path)
             return LicenseInfo(
-                valid=data.get("valid", False),
-                tier=data.get("tier", "pro"),
-                reason=data.get("reason"),
-                expires_at=data.get("expires_at")
+                valid=True,
+                tier=cache.get("tier", "pro"),
+                expires_at=cache.get("expires_at"),
+                cached=True
             )
     
+    # Nothing usable cached - this answer has to come from the server
+    # (requests is only imported when a check actually goes to the network)
+    import requests
+    try:
+        info = _refresh_from_server(license_key, cache_path)
     except requests.RequestException:
-        # Extended offline grace (30 days)
-        if cache_path.exists():
-            try:
-                cache = json.loads(cache_path.read_text())
-                verified_at = datetime.fromisoformat(cache["verified_at"])
-                extended_grace = timedelta(days=30)
-                
-                if datetime.utcnow() - verified_at < extended_grace and cache.get("valid"):
-                    return LicenseInfo(
-                        valid=True,
-                        tier=cache.get("tier", "pro"),
-                        reason="Offline mode (cached)",
-                        cached=True
-                    )
-            except (json.JSONDecodeError, KeyError, ValueError):
-                pass
-        
-        return LicenseInfo(valid=False, tier="free", reason="Unable to verify (offline)")
+        return LicenseInfo(valid=False, tier="free", reason=_REASON_OFFLINE)
+    if info is None:
+        return LicenseInfo(valid=False, tier="free", reason=_REASON_SERVER_ERROR)
+    return info
+
+
+def _read_license_cache(cache_path: Path) -> Optional[Tuple[float, Dict[str, Any]]]:
+    """(age in seconds, contents) of the cached server answer, or None if there isn't a readable one."""
+    try:
+        cache = json.loads(cache_path.read_text())
+        verified_at = cache.get("verified_at_epoch")
+        if verified_at is None:
+            # Cache written before verified_at_epoch existed: naive UTC ISO string
+            verified_at = datetime.fromisoformat(cache["verified_at"]).replace(
+                tzinfo=timezone.utc
+            ).timestamp()
+    except (OSError, json.JSONDecodeError, KeyError, ValueError):
+        return None
+    return time.time() - verified_at, cache
+
+
+def _refresh_from_server(license_key: str, cache_path: Path) -> Optional[LicenseInfo]:
+    """
+    Verify the key with the server and cache its answer.
+    
+    Returns None (and caches nothing) if the server answers with an error.
+    
+    Raises:
+        requests.RequestException: if the server can't be reached
+    """
+    import requests
+    
+    response = requests.post(
+        LICENSE_API_URL,
+        json={"license_key": license_key},
+        timeout=5
+    )
+    
+    if not response.ok:
+        return None
+    
+    data = response.json()
+    
+    now = time.time()
+    cache = {
+        "valid": data.get("valid", False),
+        "tier": data.get("tier", "pro"),
+        "verified_at_epoch": int(now),
+        "verified_at": datetime.utcfromtimestamp(now).isoformat(),  # For people reading the file
+        "expires_at": data.get("expires_at")
+    }
     
-    return LicenseInfo(valid=False, tier="free", reason="Verification failed")
+    # Write-then-rename so a concurrent reader never sees a partial file
+    tmp_path = cache_path.with_suffix('.json.tmp')
+    tmp_path.write_text(json.dumps(cache, indent=2))
+    os.replace(tmp_path, cache_path)
+    
+    return LicenseInfo(
+        valid=data.get("valid", False),
+        tier=data.get("tier", "pro"),
+        reason=data.get("reason"),
+        expires_at=data.get("expires_at")
+    )
+
+
+def _refresh_in_background(license_key: str, cache_path: Path) -> None:
+    """Re-verify the key on a daemon thread (at most one at a time)."""
+    global _refreshing
+    with _refresh_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    
+    threading.Thread(
+        target=_background_refresh,
+        args=(license_key, cache_path),
+        name='humsana-license',
+        daemon=True
+    ).start()
+
+
+def _background_refresh(license_key: str, cache_path: Path) -> None:
+    """Thread body for _refresh_in_background()."""
+    global _license_result, _license_generation, _refreshing
+    try:
+        info = _refresh_from_server(license_key, cache_path)
+    except Exception:
+        info = None
+    
+    with _refresh_lock:
+        _refreshing = False
+        if info is not None:
+            # Fresh answer on disk: make the next verify_license() read it
+            _license_generation += 1
+            _license_result = None
+        # Otherwise (offline or an error response) keep using the cached
+        # answer; the next re-check waits for the in-process result to expire
 
 
 # ============================================================
 # CONFIG DATACLASS
 # ============================================================
 
-@dataclass
+@dataclass(frozen=True)
 class HumsanaConfig:
-    """Configuration settings for Humsana."""
+    """
+    Configuration settings for Humsana.
+    
+    Frozen: load_config() hands the same cached instance to every caller,
+    so changes go through dataclasses.replace() and save_config().
+    """
     
     # === INTERLOCK SETTINGS ===
     execution_mode: str = 'dry_run'
@@ -198,22 +350,16 @@ class HumsanaConfig:
     enable_dangerous_command_alerts: bool = True
     enable_slack_status: bool = True  # NEW: Toggle for Slack auto-status
     
-    # === LICENSE (computed at runtime) ===
-    _license_info: Optional[LicenseInfo] = field(default=None, repr=False)
-    
+    # === LICENSE (computed at runtime, shared by all instances) ===
     @property
     def is_pro(self) -> bool:
         """Check if user has a valid Pro license."""
-        if self._license_info is None:
-            self._license_info = verify_license()
-        return self._license_info.valid
+        return verify_license().valid
     
     @property
     def license_tier(self) -> str:
         """Get the current license tier."""
-        if self._license_info is None:
-            self._license_info = verify_license()
-        return self._license_info.tier
+        return verify_license().tier
     
     @property
     def effective_execution_mode(self) -> str:
@@ -227,55 +373,129 @@ class HumsanaConfig:
 # CONFIG LOADING
 # ============================================================
 
+# Keys load_config() takes from config.yaml
+_CONFIG_FIELDS = frozenset(f.name for f in fields(HumsanaConfig))
+
+# Credentials (webhook URLs embed their secret) - never copied into
+# config_cache.json
+_SECRET_FIELDS = ('slack_user_token', 'webhook_key', 'webhook_url', 'webhooks')
+
+# Last loaded config, with the (mtime_ns, size, ctime_ns, inode) of the file
+# it came from (None if there was no file). The ctime can't be set back by
+# cp -p / rsync -t and a write-and-rename changes the inode, so a same-size
+# edit with a restored mtime still shows up.
+_config_cache: Optional[Tuple[Optional[Tuple[int, int, int, int]], HumsanaConfig]] = None
+
+
 def load_config() -> HumsanaConfig:
-    """Load configuration from ~/.humsana/config.yaml"""
+    """
+    Load configuration from ~/.humsana/config.yaml
+    
+    The parsed config is reused until the file changes on disk, so repeat
+    calls in one process cost a stat() rather than a YAML parse.
+    """
+    global _config_cache
     config_path = get_config_path()
     
-    if not config_path.exists():
-        return HumsanaConfig()
+    try:
+        st = config_path.stat()
+        key = (st.st_mtime_ns, st.st_size, st.st_ctime_ns, st.st_ino)
+    except FileNotFoundError:
+        key = None
+    
+    if _config_cache is not None and _config_cache[0] == key:
+        return _config_cache[1]
     
+    config = HumsanaConfig() if key is None else _parse_config(config_path)
+    _config_cache = (key, config)
+    return config
+
+
+def _parse_config(config_path: Path) -> HumsanaConfig:
+    """Read and parse the config file."""
     try:
-        with open(config_path, 'r') as f:
-            data = yaml.safe_load(f) or {}
+        data = _read_config_data(config_path)
         
-        return HumsanaConfig(
-            # Interlock settings
-            execution_mode=data.get('execution_mode', 'dry_run'),
-            fatigue_threshold=data.get('fatigue_threshold', 70),
-            dangerous_commands=data.get('dangerous_commands', DEFAULT_DANGEROUS_COMMANDS.copy()),
-            deny_patterns=data.get('deny_patterns', []),
-            allow_patterns=data.get('allow_patterns', []),
-            
-            # Webhook settings (v2.0)
-            webhook_url=data.get('webhook_url'),
-            webhook_type=data.get('webhook_type', 'generic'),
-            webhook_key=data.get('webhook_key'),
-            
-            # Slack settings (v2.0)
-            slack_user_token=data.get('slack_user_token'),
-            slack_status_expiration_minutes=data.get('slack_status_expiration_minutes', 60),
-            enable_slack_status=data.get('enable_slack_status', True),
-            
-            # Original settings
-            stress_threshold=data.get('stress_threshold', 0.7),
-            focus_threshold=data.get('focus_threshold', 0.6),
-            analysis_interval=data.get('analysis_interval', 30),
-            batch_size=data.get('batch_size', 100),
-            data_retention_days=data.get('data_retention_days', 7),
-            webhooks=data.get('webhooks', {}),
-            
-            # Pro features
-            enable_macos_dnd=data.get('enable_macos_dnd', False),
-            enable_dangerous_command_alerts=data.get('enable_dangerous_command_alerts', True),
-        )
+        # Settings missing from the file take the dataclass defaults;
+        # unknown keys are ignored
+        return HumsanaConfig(**{k: v for k, v in data.items() if k in _CONFIG_FIELDS})
     except Exception as e:
         print(f"⚠️ Error loading config: {e}")
         print("Using default configuration.")
         return HumsanaConfig()
 
 
+def _read_config_data(config_path: Path) -> Any:
+    """
+    The config file's parsed contents.
+    
+    Parsed YAML is also kept as JSON in config_cache.json, tagged with a
+    SHA-256 of the config.yaml bytes it came from, so later processes skip
+    importing PyYAML and parsing until the contents change. Hashing the
+    bytes (not trusting stat fields) means a rotated token is never missed.
+    A config holding credentials isn't cached at all, so no second copy of
+    a token sits on disk.
+    """
+    # One read of the raw bytes; libyaml detects the encoding itself
+    raw = config_path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    
+    cache_path = get_config_cache_path()
+    try:
+        cache = json.loads(cache_path.read_text())
+        if cache["source"] == digest:
+            return cache["data"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        pass
+    
+    yaml, loader, _ = _yaml()
+    data = yaml.load(raw, Loader=loader) or {}
+    
+    if isinstance(data, dict) and any(data.get(k) for k in _SECRET_FIELDS):
+        _remove_config_cache_file()
+        return data
+    
+    # Only cache what JSON gives back unchanged (not e.g. YAML dates or
+    # non-string keys)
+    try:
+        text = json.dumps({"source": digest, "data": data})
+    except (TypeError, ValueError):
+        return data
+    if json.loads(text)["data"] != data:
+        return data
+    
+    # Owner-only like a token-holding config should be; write-then-rename
+    # so a concurrent reader never sees a partial file
+    tmp_path = cache_path.with_suffix('.json.tmp')
+    try:
+        # O_CREAT keeps the mode of a leftover tmp file, which may be wider
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Just a cache - the next load parses the YAML again
+    
+    return data
+
+
+def _remove_config_cache_file() -> None:
+    """Delete config_cache.json, if there is one."""
+    try:
+        os.unlink(get_config_cache_path())
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠️ Could not remove config cache: {e}")
+
+
 def save_config(config: HumsanaConfig) -> None:
     """Save configuration to ~/.humsana/config.yaml"""
+    global _config_cache
     config_path = get_config_path()
     config_path.parent.mkdir(exist_ok=True)
     
@@ -313,8 +533,46 @@ def save_config(config: HumsanaConfig) -> None:
     if config.slack_user_token:
         data['slack_user_token'] = config.slack_user_token
     
-    with open(config_path, 'w') as f:
-        yaml.dump(data, f, default_flow_style=False)
+    yaml, _, dumper = _yaml()
+    text = yaml.dump(data, Dumper=dumper, default_flow_style=False)
+    
+    try:
+        unchanged = config_path.read_text() == text
+    except FileNotFoundError:
+        unchanged = False
+    
+    # Nothing to do if the file already says exactly this
+    if not unchanged:
+        _write_config_file(config_path, text)
+    
+    # Force the next load_config() to re-read what was just written, and
+    # drop the on-disk copy so nothing from the old contents outlives them
+    _config_cache = None
+    _remove_config_cache_file()
+
+
+def _write_config_file(config_path: Path, text: str) -> None:
+    """
+    Replace the config file's contents in one write and an atomic rename,
+    so a crash or a concurrent load_config() never sees a partial file.
+    The existing file's permissions are kept (it can hold tokens); the new
+    contents are owner-only until then. A symlinked config.yaml (e.g. from
+    a dotfile manager) is written through, not replaced by a regular file.
+    """
+    config_path = config_path.resolve()
+    tmp_path = config_path.with_suffix('.yaml.tmp')
+    try:
+        tmp_path.unlink()  # Leftover from a crash; O_CREAT won't reset its mode
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    try:
+        os.chmod(tmp_path, config_path.stat().st_mode)
+    except FileNotFoundError:
+        pass
+    os.replace(tmp_path, config_path)
 
 
 def get_example_config() -> str:
@@ -391,69 +649,86 @@ enable_dangerous_command_alerts: true
 def create_default_config() -> None:
     """Create a default config file if it doesn't exist."""
     config_path = get_config_path()
-    if not config_path.exists():
-        config_path.parent.mkdir(exist_ok=True)
-        with open(config_path, 'w') as f:
+    config_path.parent.mkdir(exist_ok=True)
+    try:
+        # 'x' fails if the file exists: one open() instead of exists() + open()
+        with open(config_path, 'x') as f:
             f.write(get_example_config())
-        print(f"✅ Created default config at {config_path}")
+    except FileExistsError:
+        return
+    print(f"✅ Created default config at {config_path}")
 
 
 def reset_config() -> None:
     """Reset config to defaults (overwrites existing)."""
     config_path = get_config_path()
     config_path.parent.mkdir(exist_ok=True)
-    with open(config_path, 'w') as f:
-        f.write(get_example_config())
+    _write_config_file(config_path, get_example_config())
     print(f"✅ Reset config to defaults at {config_path}")
 
 
 def print_config() -> None:
     """Print current configuration."""
     config = load_config()
-    license_info = verify_license()
     
-    print("\n📋 Current Humsana Configuration:")
-    print(f"   Execution mode: {config.execution_mode}")
-    print(f"   Effective mode: {config.effective_execution_mode}")
-    print(f"   Fatigue threshold: {config.fatigue_threshold}%")
-    print(f"   Dangerous patterns: {len(config.dangerous_commands)} built-in + {len(config.deny_patterns)} custom")
-    print()
-    print("📡 Notifications:")
-    print(f"   Slack: {'configured' if config.slack_user_token else 'not set'}")
-    print(f"   Webhook: {'configured' if config.webhook_url else 'not set'}")
+    lines = [
+        "\n📋 Current Humsana Configuration:",
+        f"   Execution mode: {config.execution_mode}",
+        f"   Fatigue threshold: {config.fatigue_threshold}%",
+        f"   Dangerous patterns: {len(config.dangerous_commands)} built-in + {len(config.deny_patterns)} custom",
+        "",
+        "📡 Notifications:",
+        f"   Slack: {'configured' if config.slack_user_token else 'not set'}",
+        f"   Webhook: {'configured' if config.webhook_url else 'not set'}",
+    ]
     if config.webhook_url:
-        print(f"   Webhook type: {config.webhook_type}")
-    print()
-    print(f"🔐 License:")
-    print(f"   Tier: {license_info.tier.upper()}")
-    print(f"   Valid: {'✅ Yes' if license_info.valid else '❌ No'}")
+        lines.append(f"   Webhook type: {config.webhook_type}")
+    lines.append("")
+    
+    # The license may need a network round trip; show the local settings
+    # above before waiting on it
+    print("\n".join(lines), flush=True)
+    license_info = verify_license()
+    
+    lines = [
+        "🔐 License:",
+        f"   Tier: {license_info.tier.upper()}",
+        f"   Valid: {'✅ Yes' if license_info.valid else '❌ No'}",
+        f"   Effective mode: {config.effective_execution_mode}",
+    ]
     if license_info.reason:
-        print(f"   Status: {license_info.reason}")
+        lines.append(f"   Status: {license_info.reason}")
     if not license_info.valid:
-        print(f"\n   To activate Pro: https://humsana.com/pro")
-    print()
+        lines.append("\n   To activate Pro: https://humsana.com/pro")
+    lines.append("")
+    print("\n".join(lines))
 
 
 def show_license_status() -> None:
     """Display current license status."""
     info = verify_license()
     
-    print("\n🔐 LICENSE STATUS")
-    print("=" * 40)
-    print(f"   Tier:    {info.tier.upper()}")
-    print(f"   Valid:   {'✅ Yes' if info.valid else '❌ No'}")
+    lines = [
+        "\n🔐 LICENSE STATUS",
+        "=" * 40,
+        f"   Tier:    {info.tier.upper()}",
+        f"   Valid:   {'✅ Yes' if info.valid else '❌ No'}",
+    ]
     
     if info.reason:
-        print(f"   Status:  {info.reason}")
+        lines.append(f"   Status:  {info.reason}")
     if info.expires_at:
-        print(f"   Expires: {info.expires_at}")
+        lines.append(f"   Expires: {info.expires_at}")
     if info.cached:
-        print(f"   (Using cached verification)")
+        lines.append("   (Using cached verification)")
     
     if not info.valid:
-        print("\n   To activate Pro:")
-        print("   1. Purchase at https://humsana.com/pro")
-        print("   2. Save license key to ~/.humsana/license.key")
-        print("   3. Restart the daemon")
+        lines += [
+            "\n   To activate Pro:",
+            "   1. Purchase at https://humsana.com/pro",
+            "   2. Save license key to ~/.humsana/license.key",
+            "   3. Restart the daemon",
+        ]
     
-    print()
\ No newline at end of file
+    lines.append("")
+    print("\n".join(lines))
@@ -7,7 +7,10 @@ Implements the "Break Glass" protocol for overrides.
 """
 
 import re
+import sqlite3
 import subprocess
+import sys
+import time
 from typing import Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -45,12 +48,27 @@ class HumsanaInterlock:
         re.IGNORECASE
     )
     
+    # A stress reading is reused for this long (seconds), so the checks
+    # made for one tool call share a single 5-minute average query
+    STRESS_TTL = 1.0
+    
     def __init__(self):
         self.config = load_config()
         self.tracker = get_activity_tracker()
         self.audit = get_audit_logger()
         self.db = LocalDatabase()
         
+        # Patterns lower-cased once, so each check is just substring tests
+        self._deny_patterns = tuple(
+            pattern.lower()
+            for pattern in self.config.dangerous_commands + self.config.deny_patterns
+        )
+        self._allow_patterns = tuple(pattern.lower() for pattern in self.config.allow_patterns)
+        
+        # (time.monotonic() when read, stress level) from the last query
+        self._stress_cache: Optional[Tuple[float, float]] = None
+        self._stress_warned = False  # Database read failure already reported
+        
         # Pending override state (resets after use)
         self._pending_override_reason: Optional[str] = None
     
@@ -69,7 +87,7 @@ class HumsanaInterlock:
         uptime_hours = fatigue_status['uptime_hours']
         
         # Check if command is dangerous
-        is_dangerous = self._is_dangerous_command(command)
+        is_dangerous = self._is_dangerous_command(command.lower())
         
         # Check if blocked by fatigue
         should_block = is_dangerous and fatigue_level > self.config.fatigue_threshold
@@ -113,6 +131,13 @@ class HumsanaInterlock:
         Returns:
             (is_valid_override, reason)
         """
+        # Most messages aren't overrides: a plain substring test rules them
+        # out far faster than the case-insensitive regex scan. Only ASCII
+        # letters case-match the ones in "protocol:", so this never skips
+        # a message the pattern would match.
+        if 'protocol:' not in message.lower():
+            return False, None
+        
         match = self.OVERRIDE_PATTERN.search(message)
         if match:
             reason = match.group(1).strip()
@@ -146,8 +171,9 @@ class HumsanaInterlock:
         fatigue_category = fatigue_status['fatigue_category']
         uptime_hours = fatigue_status['uptime_hours']
         
-        # Check if dangerous
-        is_dangerous = self._is_dangerous_command(command)
+        # Check if dangerous (lower-cased once for every pattern check below)
+        command_lower = command.lower()
+        is_dangerous = self._is_dangerous_command(command_lower)
         should_block = is_dangerous and fatigue_level > self.config.fatigue_threshold
         
         # Handle override
@@ -168,6 +194,7 @@ class HumsanaInterlock:
             # Execute or simulate
             return self._execute_or_simulate(
                 command, 
+                command_lower,
                 fatigue_level, 
                 fatigue_category,
                 uptime_hours,
@@ -222,14 +249,33 @@ class HumsanaInterlock:
         
         return self._execute_or_simulate(
             command, 
+            command_lower,
             fatigue_level, 
             fatigue_category,
             uptime_hours
         )
     
+    async def aexecute_command(
+        self,
+        command: str,
+        override_reason: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        execute_command() for asyncio callers (e.g. an async MCP server).
+        
+        The check and the command (up to its 30 second timeout) run on the
+        event loop's default executor, so other requests keep being served
+        meanwhile.
+        """
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.execute_command, command, override_reason
+        )
+    
     def _execute_or_simulate(
         self, 
         command: str,
+        command_lower: str,
         fatigue_level: int,
         fatigue_category: str,
         uptime_hours: float,
@@ -261,8 +307,8 @@ class HumsanaInterlock:
         # Live execution
         try:
             # Check allowlist if configured
-            if self.config.allow_patterns:
-                if not self._matches_patterns(command, self.config.allow_patterns):
+            if self._allow_patterns:
+                if not self._matches_patterns(command_lower, self._allow_patterns):
                     return {
                         'status': 'BLOCKED',
                         'error': 'Command not in allowlist',
@@ -308,37 +354,37 @@ class HumsanaInterlock:
                 'mode': 'live'
             }
     
-    def _is_dangerous_command(self, command: str) -> bool:
-        """Check if a command matches dangerous patterns."""
-        command_lower = command.lower()
-        
-        # Check hardcoded dangerous commands
-        for pattern in self.config.dangerous_commands:
-            if pattern.lower() in command_lower:
-                return True
-        
-        # Check user-defined deny patterns
-        for pattern in self.config.deny_patterns:
-            if pattern.lower() in command_lower:
-                return True
-        
-        return False
+    def _is_dangerous_command(self, command_lower: str) -> bool:
+        """Check if a lower-cased command matches dangerous patterns (built-in or deny_patterns)."""
+        return self._matches_patterns(command_lower, self._deny_patterns)
     
-    def _matches_patterns(self, command: str, patterns: list) -> bool:
-        """Check if command matches any pattern in list."""
-        command_lower = command.lower()
+    def _matches_patterns(self, command_lower: str, patterns: Tuple[str, ...]) -> bool:
+        """Check if a lower-cased command matches any (also lower-cased) pattern."""
         for pattern in patterns:
-            if pattern.lower() in command_lower:
+            if pattern in command_lower:
                 return True
         return False
     
     def _get_current_stress(self) -> float:
         """Get current stress level from the daemon's analysis."""
+        now = time.monotonic()
+        cached = self._stress_cache
+        if cached is not None and now - cached[0] < self.STRESS_TTL:
+            return cached[1]
+        
         try:
             metrics = self.db.get_average_metrics(minutes=5)
-            return metrics.get('stress_level', 0.0)
-        except:
+            stress = metrics.get('stress_level', 0.0)
+        except sqlite3.Error as e:
+            # Fall back to "no stress data", but say so once - otherwise a
+            # broken database silently reads as a relaxed user forever.
+            # (stderr: stdout may be carrying the MCP protocol)
+            if not self._stress_warned:
+                self._stress_warned = True
+                print(f"⚠️ Could not read stress level from the database: {e}", file=sys.stderr)
             return 0.0
+        self._stress_cache = (now, stress)
+        return stress
     
     def _truncate(self, s: str, max_len: int = 50) -> str:
         """Truncate string for display."""
@@ -7,12 +7,17 @@ PRIVACY: Only stores aggregated metrics, never raw keystrokes.
 
 import sqlite3
 import os
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 from contextlib import contextmanager
 
-from .analyzer import AnalysisResult, UserState
+# Type-only: importing the analyzer pulls in the collector and pynput,
+# which the one-shot CLI commands that read this database don't need
+if TYPE_CHECKING:
+    from .analyzer import AnalysisResult
 
 
 def get_db_path() -> Path:
@@ -37,17 +42,33 @@ class LocalDatabase:
     - Actual typed content
     """
     
+    # Set on every new connection. WAL itself is stored in the database
+    # file, so it's switched on once in _init_db(); in WAL mode readers
+    # (e.g. `humsana status`) don't block the daemon's writes, and
+    # synchronous=NORMAL only syncs at checkpoints
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=67108864",  # 64 MB
+        "PRAGMA cache_size=-8000",    # ~8 MB page cache
+    )
+    
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or get_db_path()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()  # One user of the connection at a time
         self._init_db()
     
     def _init_db(self) -> None:
         """Initialize database schema."""
         with self._get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS analysis_results (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp TEXT NOT NULL,
+                    ts_epoch REAL,  -- Same instant as timestamp, in seconds since the epoch
                     
                     -- Core scores (0.0 to 1.0)
                     stress_level REAL NOT NULL,
@@ -71,11 +92,18 @@ class LocalDatabase:
                 )
             """)
             
-            # Index for fast recent queries
+            self._migrate_ts_epoch(conn)
+            
+            # Indexes for fast recent queries (time windows use ts_epoch;
+            # session summaries compare against ISO start times)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_timestamp 
                 ON analysis_results(timestamp DESC)
             """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ts_epoch
+                ON analysis_results(ts_epoch DESC)
+            """)
             
             # Session tracking table
             conn.execute("""
@@ -92,17 +120,85 @@ class LocalDatabase:
             
             conn.commit()
     
+    @staticmethod
+    def _migrate_ts_epoch(conn: sqlite3.Connection) -> None:
+        """
+        Add and backfill ts_epoch in databases created before it existed.
+        
+        The daemon and the MCP server may open an old database at the same
+        moment, so the check and the ALTER run under one write lock (BEGIN
+        IMMEDIATE); the second process then sees the column and skips.
+        """
+        def has_column() -> bool:
+            return any(
+                row[1] == 'ts_epoch'
+                for row in conn.execute("PRAGMA table_info(analysis_results)")
+            )
+        
+        if has_column():
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not has_column():
+                conn.execute("ALTER TABLE analysis_results ADD COLUMN ts_epoch REAL")
+                # timestamp is naive UTC ISO text
+                conn.execute("""
+                    UPDATE analysis_results
+                    SET ts_epoch = (julianday(timestamp) - 2440587.5) * 86400.0
+                """)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(str(self.db_path))
+        """
+        Context manager for database connections.
+        
+        One connection is opened on first use and shared (callers take
+        turns), instead of connecting on every call. Uncommitted work is
+        rolled back if the block raises.
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a connection."""
+        # Shared across threads (the daemon writes from timer threads), with
+        # access serialized by self._lock
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        for pragma in self._CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def close(self) -> None:
+        """Close the shared connection (reopened if the database is used again)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
-    def store_analysis(self, result: AnalysisResult) -> int:
+    # Shared by store_analysis() and store_analyses()
+    _INSERT_ANALYSIS = """
+        INSERT INTO analysis_results (
+            timestamp, ts_epoch,
+            stress_level, focus_level, cognitive_load,
+            state, confidence,
+            response_style, avoid_clarifying_questions, interruptible,
+            typing_wpm, backspace_ratio, rhythm_variance, idle_seconds
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def store_analysis(self, result: 'AnalysisResult') -> int:
         """
         Store an analysis result.
         
@@ -110,32 +206,48 @@ class LocalDatabase:
             The ID of the inserted row.
         """
         with self._get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT INTO analysis_results (
-                    timestamp,
-                    stress_level, focus_level, cognitive_load,
-                    state, confidence,
-                    response_style, avoid_clarifying_questions, interruptible,
-                    typing_wpm, backspace_ratio, rhythm_variance, idle_seconds
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.utcnow().isoformat(),
-                result.stress_level,
-                result.focus_level,
-                result.cognitive_load,
-                result.state.value,
-                result.confidence,
-                result.response_style,
-                1 if result.avoid_clarifying_questions else 0,
-                1 if result.interruptible else 0,
-                result.typing_wpm,
-                result.backspace_ratio,
-                result.rhythm_variance,
-                result.idle_seconds
-            ))
+            cursor = conn.execute(
+                self._INSERT_ANALYSIS,
+                self._analysis_row(time.time(), result)
+            )
             conn.commit()
             return cursor.lastrowid
     
+    def store_analyses(self, results: List[Tuple[float, 'AnalysisResult']]) -> None:
+        """
+        Store several analysis results in one transaction.
+        
+        Args:
+            results: (time.time(), result) pairs, timestamped when each
+                analysis was made
+        """
+        with self._get_connection() as conn:
+            conn.executemany(
+                self._INSERT_ANALYSIS,
+                [self._analysis_row(ts, result) for ts, result in results]
+            )
+            conn.commit()
+    
+    @staticmethod
+    def _analysis_row(epoch: float, result: 'AnalysisResult') -> tuple:
+        """Column values for one analysis_results row."""
+        return (
+            datetime.utcfromtimestamp(epoch).isoformat(),
+            epoch,
+            result.stress_level,
+            result.focus_level,
+            result.cognitive_load,
+            result.state.value,
+            result.confidence,
+            result.response_style,
+            1 if result.avoid_clarifying_questions else 0,
+            1 if result.interruptible else 0,
+            result.typing_wpm,
+            result.backspace_ratio,
+            result.rhythm_variance,
+            result.idle_seconds
+        )
+    
     def get_recent_analyses(
         self, 
         count: int = 10,
@@ -152,14 +264,14 @@ class LocalDatabase:
             if minutes:
                 cursor = conn.execute("""
                     SELECT * FROM analysis_results
-                    WHERE timestamp > datetime('now', ?)
-                    ORDER BY timestamp DESC
+                    WHERE ts_epoch > ?
+                    ORDER BY ts_epoch DESC
                     LIMIT ?
-                """, (f'-{minutes} minutes', count))
+                """, (time.time() - minutes * 60, count))
             else:
                 cursor = conn.execute("""
                     SELECT * FROM analysis_results
-                    ORDER BY timestamp DESC
+                    ORDER BY ts_epoch DESC
                     LIMIT ?
                 """, (count,))
             
@@ -176,7 +288,10 @@ class LocalDatabase:
         This is what the MCP server will expose to Claude.
         """
         with self._get_connection() as conn:
-            cursor = conn.execute("""
+            # Plain tuples here: the one aggregate row is unpacked by position
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute("""
                 SELECT 
                     AVG(stress_level) as avg_stress,
                     AVG(focus_level) as avg_focus,
@@ -185,18 +300,19 @@ class LocalDatabase:
                     AVG(backspace_ratio) as avg_backspace,
                     COUNT(*) as sample_count
                 FROM analysis_results
-                WHERE timestamp > datetime('now', ?)
-            """, (f'-{minutes} minutes',))
+                WHERE ts_epoch > ?
+            """, (time.time() - minutes * 60,))
             
-            row = cursor.fetchone()
-            if row and row['sample_count'] > 0:
+            (avg_stress, avg_focus, avg_cognitive_load,
+             avg_wpm, avg_backspace, sample_count) = cursor.fetchone()
+            if sample_count > 0:
                 return {
-                    "stress_level": round(row['avg_stress'] or 0, 3),
-                    "focus_level": round(row['avg_focus'] or 0, 3),
-                    "cognitive_load": round(row['avg_cognitive_load'] or 0, 3),
-                    "typing_wpm": round(row['avg_wpm'] or 0, 1),
-                    "backspace_ratio": round(row['avg_backspace'] or 0, 3),
-                    "sample_count": row['sample_count'],
+                    "stress_level": round(avg_stress or 0, 3),
+                    "focus_level": round(avg_focus or 0, 3),
+                    "cognitive_load": round(avg_cognitive_load or 0, 3),
+                    "typing_wpm": round(avg_wpm or 0, 1),
+                    "backspace_ratio": round(avg_backspace or 0, 3),
+                    "sample_count": sample_count,
                     "window_minutes": minutes
                 }
             
@@ -216,11 +332,11 @@ class LocalDatabase:
             cursor = conn.execute("""
                 SELECT state, COUNT(*) as count
                 FROM analysis_results
-                WHERE timestamp > datetime('now', ?)
+                WHERE ts_epoch > ?
                 GROUP BY state
                 ORDER BY count DESC
                 LIMIT 1
-            """, (f'-{minutes} minutes',))
+            """, (time.time() - minutes * 60,))
             
             row = cursor.fetchone()
             return row['state'] if row else 'relaxed'
@@ -301,7 +417,7 @@ class LocalDatabase:
         with self._get_connection() as conn:
             cursor = conn.execute("""
                 DELETE FROM analysis_results
-                WHERE timestamp < datetime('now', ?)
-            """, (f'-{days} days',))
+                WHERE ts_epoch < ?
+            """, (time.time() - days * 86400,))
             conn.commit()
             return cursor.rowcount
\ No newline at end of file
@@ -9,15 +9,18 @@ This is a PRO feature that provides:
 Privacy: Only sends state labels, never behavioral data.
 """
 
+import hashlib
+import queue
+import threading
 import time
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True)
 class SlackStatus:
-    """Slack status configuration."""
+    """Slack status configuration (shared STATUS_MAP entries, so immutable)."""
     text: str
     emoji: str
 
@@ -43,9 +46,42 @@ class NotificationManager:
         "relaxed": SlackStatus(text="", emoji=""),  # Clear status
     }
     
+    # Circuit breaker: after this many back-to-back webhook connection
+    # failures, stop sending for WEBHOOK_COOLDOWN seconds instead of
+    # spending the full timeout on every alert while the endpoint is down
+    WEBHOOK_FAIL_THRESHOLD = 3
+    WEBHOOK_COOLDOWN = 30
+    
+    # Longest we wait for the sender thread on shutdown: room for the
+    # in-flight request plus a final Slack clear, each of which can take
+    # the 5s connect timeout and then the 5s read timeout
+    STOP_TIMEOUT = 20
+    
+    # Emoji prefix for generic webhook messages
+    EVENT_EMOJI: Dict[str, str] = {
+        "blocked": "🛑",
+        "override": "🚨",
+        "allowed": "✅",
+    }
+    
+    # States that clear the Slack status instead of setting one
+    CLEAR_STATES = frozenset({"relaxed", "idle"})
+    
     # Status expiration (safety net for crashed daemons)
     STATUS_EXPIRATION_SECONDS = 3600  # 1 hour
     
+    # Notifications waiting for the sender thread; past this, new ones are
+    # dropped rather than letting a stalled endpoint back up the daemon.
+    MAX_PENDING = 256
+    
+    # A new state must hold this long before it reaches Slack, so flapping
+    # between states costs one status update instead of one per flip
+    STATE_DEBOUNCE_SECONDS = 15
+    
+    # Repeat PagerDuty/OpsGenie alerts for the same condition inside this
+    # window are not re-sent; they would only collapse onto the open incident
+    ALERT_DEDUP_WINDOW = 300  # 5 minutes
+    
     def __init__(
         self,
         slack_user_token: Optional[str] = None,
@@ -67,9 +103,106 @@ class NotificationManager:
         self.webhook_type = webhook_type
         self.webhook_key = webhook_key
         
+        # Payload formatter for this webhook type, picked once
+        self._format_payload = {
+            "pagerduty": self._format_pagerduty,
+            "opsgenie": self._format_opsgenie,
+        }.get(webhook_type, self._format_generic)
+        
+        # One keep-alive session for Slack and the webhook, so calls after
+        # the first skip the TCP + TLS handshake. The Slack token is sent
+        # per request, never as a session default, so it can't reach the
+        # webhook host.
+        self._session = requests.Session()
+        
         # Track last status to avoid API spam
         self.last_slack_status: Optional[SlackStatus] = None
         self.last_state: Optional[str] = None
+        
+        # Debounce: the state waiting out STATE_DEBOUNCE_SECONDS, its timer,
+        # and the last state actually handed to the sender thread
+        self._pending_state: Optional[str] = None
+        self._state_timer: Optional[threading.Timer] = None
+        self._slack_state: Optional[str] = None
+        self._state_lock = threading.Lock()
+        
+        # Circuit breaker state (see WEBHOOK_FAIL_THRESHOLD)
+        self._webhook_fail_count = 0
+        self._webhook_open_until = 0.0
+        
+        # dedup_key -> monotonic time it was last queued; dropped again if
+        # that alert never arrives, so the next repeat gets another try
+        self._last_alert_keys: Dict[str, float] = {}
+        self._alert_lock = threading.Lock()
+        
+        # HTTP calls run on a sender thread so a slow Slack or PagerDuty
+        # never holds up the analyzer or the Interlock
+        self._q: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=self.MAX_PENDING)
+        self._worker_thread = threading.Thread(
+            target=self._worker, name='humsana-notify', daemon=True
+        )
+        self._worker_thread.start()
+    
+    def _worker(self) -> None:
+        """Send queued notifications until the None sentinel arrives."""
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            kind, arg = item
+            try:
+                if kind == "slack":
+                    self._update_slack_status(arg)
+                elif kind == "clear":
+                    arg.append(self._set_slack_status("", "", 0))
+                else:
+                    payload, key = arg
+                    sent = (time.monotonic() >= self._webhook_open_until
+                            and self._post_webhook(payload))
+                    if not sent and key is not None:
+                        self._forget_alert_key(key)
+            except Exception as e:
+                print(f"⚠️ Notification failed: {e}")
+    
+    def _enqueue(self, item: tuple) -> bool:
+        """Hand a notification to the sender thread; drop it if the queue is full."""
+        try:
+            self._q.put_nowait(item)
+            return True
+        except queue.Full:
+            print(f"⚠️ Notification queue full, dropping {item[0]} update")
+            return False
+    
+    def _stop_worker(self, final: Optional[tuple] = None) -> bool:
+        """
+        Discard pending notifications and stop the sender thread.
+        
+        `final` is queued as the thread's last job, so it runs after any
+        request already in flight. Returns False if the thread was already
+        stopped and `final` was not queued.
+        """
+        with self._state_lock:
+            if self._state_timer:
+                self._state_timer.cancel()
+            self._pending_state = None
+            self._state_timer = None
+        if not self._worker_thread.is_alive():
+            return False
+        try:
+            while True:
+                self._q.get_nowait()
+        except queue.Empty:
+            pass
+        if final is not None:
+            self._q.put(final)
+        self._q.put(None)
+        
+        # Joined in slices: an untimed lock wait can't be interrupted by
+        # Ctrl+C on Windows
+        deadline = time.monotonic() + self.STOP_TIMEOUT
+        while self._worker_thread.is_alive() and time.monotonic() < deadline:
+            self._worker_thread.join(timeout=0.5)
+        return True
     
     def update_state(self, state: str, metrics: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -86,9 +219,29 @@ class NotificationManager:
         
         self.last_state = state
         
-        # Update Slack status if token exists
+        # Update Slack status if token exists, once the state has settled
         if self.slack_user_token:
-            self._update_slack_status(state)
+            with self._state_lock:
+                if self._state_timer:
+                    self._state_timer.cancel()
+                self._pending_state = state
+                self._state_timer = threading.Timer(
+                    self.STATE_DEBOUNCE_SECONDS, self._flush_state, args=(state,)
+                )
+                self._state_timer.daemon = True
+                self._state_timer.start()
+    
+    def _flush_state(self, state: str) -> None:
+        """Timer callback: queue the Slack update if the state held."""
+        with self._state_lock:
+            if state != self._pending_state:
+                return
+            self._pending_state = None
+            self._state_timer = None
+            if state == self._slack_state:
+                return  # flapped away and back; Slack already shows it
+            self._slack_state = state
+        self._enqueue(("slack", state))
     
     def send_safety_alert(
         self, 
@@ -97,33 +250,67 @@ class NotificationManager:
     ) -> bool:
         """
         Called when Interlock blocks or overrides a command.
-        Sends to configured webhook.
+        Queues the event for the configured webhook.
         
         Args:
             event_type: "blocked" | "override" | "allowed"
             details: Event details (command, fatigue, etc.)
         
         Returns:
-            True if webhook was sent successfully
+            True if the alert was queued for sending
         """
         if not self.webhook_url:
             return False
         
+        if time.monotonic() < self._webhook_open_until:
+            return False
+        
+        key = None
+        if self.webhook_type in ("pagerduty", "opsgenie"):
+            key = self._dedup_key(event_type, details)
+            now = time.monotonic()
+            with self._alert_lock:
+                if now - self._last_alert_keys.get(key, float("-inf")) < self.ALERT_DEDUP_WINDOW:
+                    return True
+                self._last_alert_keys = {
+                    k: t for k, t in self._last_alert_keys.items()
+                    if now - t < self.ALERT_DEDUP_WINDOW
+                }
+                self._last_alert_keys[key] = now
+        
+        payload = self._format_payload(event_type, details)
+        if self._enqueue(("webhook", (payload, key))):
+            return True
+        if key is not None:
+            self._forget_alert_key(key)
+        return False
+    
+    def _forget_alert_key(self, key: str) -> None:
+        """Un-suppress an alert whose send was dropped or failed."""
+        with self._alert_lock:
+            self._last_alert_keys.pop(key, None)
+    
+    def _post_webhook(self, payload: Dict[str, Any]) -> bool:
+        """POST a formatted payload to the webhook. Returns True on a 2xx."""
         try:
-            payload = self._format_webhook_payload(event_type, details)
-            
-            response = requests.post(
+            response = self._session.post(
                 self.webhook_url,
                 json=payload,
                 timeout=5,
                 headers={"Content-Type": "application/json"}
             )
             
+            self._webhook_fail_count = 0
             return response.ok
             
         except Exception as e:
             # Fail silently - webhooks are best-effort
             print(f"⚠️ Webhook failed: {e}")
+            self._webhook_fail_count += 1
+            if self._webhook_fail_count >= self.WEBHOOK_FAIL_THRESHOLD:
+                self._webhook_fail_count = 0
+                self._webhook_open_until = time.monotonic() + self.WEBHOOK_COOLDOWN
+                print(f"⚠️ Webhook unreachable, pausing alerts for {self.WEBHOOK_COOLDOWN}s")
             return False
     
     def _update_slack_status(self, state: str) -> bool:
@@ -140,7 +327,8 @@ class NotificationManager:
             True if status was updated successfully
         """
         # Handle idle/relaxed - clear status immediately
-        if state in ("relaxed", "idle"):
+        if state in self.CLEAR_STATES:
+            self.last_slack_status = None
             return self._set_slack_status("", "", 0)
         
         # Get status for this state
@@ -148,10 +336,9 @@ class NotificationManager:
         if not status:
             return False
         
-        # Don't API spam if status hasn't changed
-        if status == self.last_slack_status:
-            return True
-        
+        # No "status unchanged" check here: update_state only queues a call
+        # when the state changed, and STATUS_MAP gives each state its own
+        # status.
         # Set expiration for safety net
         # If daemon dies, status clears automatically in 1 hour
         expiration = int(time.time()) + self.STATUS_EXPIRATION_SECONDS
@@ -197,7 +384,7 @@ class NotificationManager:
                 }
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=5)
+            response = self._session.post(url, headers=headers, json=data, timeout=5)
             result = response.json()
             
             return result.get("ok", False)
@@ -206,86 +393,88 @@ class NotificationManager:
             print(f"⚠️ Slack status update failed: {e}")
             return False
     
-    def _format_webhook_payload(
-        self, 
-        event_type: str, 
-        details: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Format webhook payload based on webhook_type.
-        
-        Supports:
-        - PagerDuty Events API v2
-        - OpsGenie (similar format)
-        - Generic JSON
-        """
-        
-        # PAGERDUTY FORMAT
-        if self.webhook_type == "pagerduty":
-            severity = "error" if event_type == "blocked" else "warning"
-            
-            return {
-                "routing_key": self.webhook_key,
-                "event_action": "trigger",
-                "dedup_key": f"humsana-{event_type}-{int(time.time())}",
-                "payload": {
-                    "summary": f"Humsana Safety Interlock: {event_type.upper()}",
-                    "source": "humsana-daemon",
-                    "severity": severity,
-                    "custom_details": {
-                        "event": event_type,
-                        "command": details.get("command", "unknown")[:100],
-                        "fatigue_level": details.get("fatigue_level", 0),
-                        "fatigue_category": details.get("fatigue_category", "unknown"),
-                        "uptime_hours": details.get("uptime_hours", 0),
-                        "override_reason": details.get("override_reason"),
-                        "user": details.get("user", "unknown"),
-                    }
-                }
-            }
+    @staticmethod
+    def _dedup_key(event_type: str, details: Dict[str, Any]) -> str:
+        """Stable incident key: the same condition maps to the same key."""
+        ident = f"{event_type}|{details.get('fatigue_category', '')}|{details.get('user', '')}"
+        digest = hashlib.blake2b(ident.encode(), digest_size=8).hexdigest()
+        return f"humsana-{event_type}-{digest}"
+    
+    def _format_pagerduty(self, event_type: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        """PagerDuty Events API v2 payload."""
+        severity = "error" if event_type == "blocked" else "warning"
         
-        # OPSGENIE FORMAT
-        elif self.webhook_type == "opsgenie":
-            priority = "P1" if event_type == "blocked" else "P3"
-            
-            return {
-                "message": f"Humsana: {event_type.upper()} - {details.get('command', 'unknown')[:50]}",
-                "alias": f"humsana-{event_type}-{int(time.time())}",
-                "priority": priority,
+        return {
+            "routing_key": self.webhook_key,
+            "event_action": "trigger",
+            "dedup_key": self._dedup_key(event_type, details),
+            "payload": {
+                "summary": f"Humsana Safety Interlock: {event_type.upper()}",
                 "source": "humsana-daemon",
-                "details": {
+                "severity": severity,
+                "custom_details": {
                     "event": event_type,
-                    "command": details.get("command", "unknown"),
-                    "fatigue_level": str(details.get("fatigue_level", 0)),
+                    "command": details.get("command", "unknown")[:100],
+                    "fatigue_level": details.get("fatigue_level", 0),
                     "fatigue_category": details.get("fatigue_category", "unknown"),
-                    "uptime_hours": str(details.get("uptime_hours", 0)),
+                    "uptime_hours": details.get("uptime_hours", 0),
+                    "override_reason": details.get("override_reason"),
+                    "user": details.get("user", "unknown"),
                 }
             }
+        }
+    
+    def _format_opsgenie(self, event_type: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        """OpsGenie alert payload."""
+        priority = "P1" if event_type == "blocked" else "P3"
         
-        # GENERIC FORMAT (Slack-compatible)
-        else:
-            emoji_map = {
-                "blocked": "🛑",
-                "override": "🚨",
-                "allowed": "✅",
-            }
-            emoji = emoji_map.get(event_type, "📋")
-            
-            return {
+        return {
+            "message": f"Humsana: {event_type.upper()} - {details.get('command', 'unknown')[:50]}",
+            "alias": self._dedup_key(event_type, details),
+            "priority": priority,
+            "source": "humsana-daemon",
+            "details": {
                 "event": event_type,
-                "level": "warning" if event_type == "blocked" else "info",
-                "message": f"{emoji} Humsana Safety Event: {event_type}",
-                "details": details,
-                "timestamp": int(time.time())
+                "command": details.get("command", "unknown"),
+                "fatigue_level": str(details.get("fatigue_level", 0)),
+                "fatigue_category": details.get("fatigue_category", "unknown"),
+                "uptime_hours": str(details.get("uptime_hours", 0)),
             }
+        }
+    
+    def _format_generic(self, event_type: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        """Generic JSON payload (Slack-compatible)."""
+        emoji = self.EVENT_EMOJI.get(event_type, "📋")
+        
+        return {
+            "event": event_type,
+            "level": "warning" if event_type == "blocked" else "info",
+            "message": f"{emoji} Humsana Safety Event: {event_type}",
+            "details": details,
+            "timestamp": int(time.time())
+        }
     
     def clear_slack_status(self) -> bool:
         """
         Explicitly clear Slack status.
         Call this when daemon shuts down cleanly.
+        
+        The clear is the sender thread's last job (anything still queued is
+        dropped), so it runs after an in-flight status update and a late
+        update can't land after it.
         """
+        result: List[bool] = []
+        queued = self._stop_worker(final=("clear", result))
         self.last_slack_status = None
-        return self._set_slack_status("", "", 0)
+        self._slack_state = None
+        if not queued:
+            return self._set_slack_status("", "", 0)
+        return bool(result and result[0])
+    
+    def close(self) -> None:
+        """Stop the sender thread and close the pooled HTTP connections."""
+        self._stop_worker()
+        self._session.close()
     
     def test_slack_connection(self) -> Dict[str, Any]:
         """
@@ -298,7 +487,7 @@ class NotificationManager:
         try:
             url = "https://slack.com/api/auth.test"
             headers = {"Authorization": f"Bearer {self.slack_user_token}"}
-            response = requests.get(url, headers=headers, timeout=5)
+            response = self._session.get(url, headers=headers, timeout=5)
             return response.json()
         except Exception as e:
             return {"ok": False, "error": str(e)}
@@ -308,7 +497,11 @@ class NotificationManager:
         Send a test webhook.
         Returns True if successful.
         """
-        return self.send_safety_alert(
+        if not self.webhook_url:
+            return False
+        
+        # Sent inline rather than queued so the caller gets the real result
+        return self._post_webhook(self._format_payload(
             event_type="test",
             details={
                 "message": "Humsana webhook test",
@@ -316,4 +509,4 @@ class NotificationManager:
                 "fatigue_category": "low",
                 "command": "echo 'test'",
             }
-        )
\ No newline at end of file
+        ))
\ No newline at end of file